@@ -170,7 +170,7 @@ async def run_evaluations(request: RunEvaluationRequest):
             _evaluation_state["results"] = None
 
         engine = EvaluationEngine()
-        results = engine.run(
+        results = await engine.arun(
             template_ids=request.template_ids,
             agent_names=request.agent_names,
             model_deployment_name=request.model_deployment_name,
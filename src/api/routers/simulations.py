@@ -65,6 +65,8 @@ def _run_simulation(engine: SimulationEngine, sim_config: SimulationConfig, sim_
         with _simulation_lock:
             _simulation_state["results"] = {"error": str(e)}
             _simulation_state["running"] = False
+    finally:
+        engine.close()
 
 
 @router.post("/start")
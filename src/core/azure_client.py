@@ -59,6 +59,7 @@ class AzureClientFactory:
         self._credential: Optional[DefaultAzureCredential] = None
         self._endpoint: Optional[str] = None  # Will be retrieved from environment when needed
         self._client_lock = threading.Lock()
+        self._credential_lock = threading.Lock()
         self._initialized = True
 
     def set_endpoint(self, endpoint: str) -> None:
@@ -82,9 +83,11 @@ class AzureClientFactory:
             DefaultAzureCredential instance
         """
         if self._credential is None:
-            print("[Azure] Creating DefaultAzureCredential...")
-            self._credential = DefaultAzureCredential()
-            print("[Azure] Credential created")
+            with self._credential_lock:
+                if self._credential is None:
+                    print("[Azure] Creating DefaultAzureCredential...")
+                    self._credential = DefaultAzureCredential()
+                    print("[Azure] Credential created")
         return self._credential
 
     def get_project_client(self) -> AIProjectClient:
@@ -236,13 +239,14 @@ def create_project_client(
 
     Args:
         endpoint: Optional custom endpoint (uses default if not provided)
-        credential: Optional Azure credential (creates DefaultAzureCredential if not provided)
+        credential: Optional Azure credential (shares the factory's DefaultAzureCredential
+            if not provided, so per-thread clients reuse its cached tokens)
 
     Returns:
         AIProjectClient instance
     """
     resolved_endpoint = resolve_project_endpoint(endpoint)
-    resolved_credential = credential or DefaultAzureCredential()
+    resolved_credential = credential or _get_factory().get_credential()
     return AIProjectClient(endpoint=resolved_endpoint, credential=resolved_credential)
 
 
@@ -252,7 +256,7 @@ def create_openai_client(endpoint: str = None, credential: DefaultAzureCredentia
 
     Args:
         endpoint: Optional custom endpoint (uses default if not provided)
-        credential: Optional Azure credential (creates DefaultAzureCredential if not provided)
+        credential: Optional Azure credential (shares the factory's credential if not provided)
 
     Returns:
         OpenAI client instance
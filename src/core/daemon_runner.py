@@ -6,21 +6,58 @@ patterns to AI agents for testing and demonstration purposes.
 """
 
 import csv
+import json
 import os
 import random
 import time
 import threading
 from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from queue import Queue, Empty, Full
 
 from .azure_client import create_openai_client
 from .metrics_collector import MetricsCollector, OperationMetric, GuardrailMetric
+from .response_utils import BLOCKING_INDICATORS, is_blocked_response, iso_now_fast
 from ..models.agent import CreatedAgent
 from ..models.industry_profile import IndustryProfile
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+_LOG_QUEUE_MAXSIZE = 10000
+_LOG_STOP = object()  # Sentinel that tells the log drainer to exit
+
+
+class _HistoryWriter:
+    """
+    Append-only JSONL writer that keeps the history file open between samples.
+
+    Each record is written immediately as one complete line in a single O_APPEND
+    write, so tailing readers never see partial samples and nothing is lost if the
+    process is killed. fsync only happens on close.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if orjson is not None:
+            line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            line = (json.dumps(record) + "\n").encode("utf-8")
+        os.write(self._fd, line)
+
+    def close(self) -> None:
+        try:
+            os.fsync(self._fd)
+        finally:
+            os.close(self._fd)
+
 
 @dataclass
 class DaemonConfig:
@@ -45,31 +82,14 @@ class DaemonConfig:
     log_each_call: bool = True  # Disable to reduce IO overhead at high rates
     log_sample_every: int = 1  # Log every Nth completed call when log_each_call is True
     latency_sample_size: int = 1000  # Rolling window for percentile estimates
+    # Reuse one conversation per worker thread and agent (off: every call starts fresh,
+    # so latency and token cost are not inflated by accumulated history).
+    reuse_conversation: bool = False
+    conversation_max_turns: int = 10  # Rotate a reused conversation after this many calls
 
 
-@dataclass
-class DaemonMetrics:
-    """Live metrics for daemon monitoring."""
-    total_calls: int = 0
-    scheduled_calls: int = 0
-    started_calls: int = 0
-    dropped_calls: int = 0
-    inflight_calls: int = 0
-    queue_depth: int = 0
-    target_calls_per_minute: float = 0.0
-    successful_calls: int = 0
-    failed_calls: int = 0
-    total_operations: int = 0
-    total_guardrails: int = 0
-    blocked_guardrails: int = 0
-    total_latency_ms: float = 0
-    max_latency_ms: float = 0
-    batches_completed: int = 0
-    start_time: Optional[datetime] = None
-    last_batch_time: Optional[datetime] = None
-    current_load_profile: str = "normal"
-    errors: List[str] = field(default_factory=list)
-    latency_samples_ms: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+class _MetricsView:
+    """Derived metric computations shared by live metrics and snapshots."""
 
     def get_success_rate(self) -> float:
         if self.total_calls == 0:
@@ -144,10 +164,85 @@ class DaemonMetrics:
             "runtime": self.get_runtime(),
             "current_load_profile": self.current_load_profile,
             "traffic_variance": self.current_load_profile,
-            "recent_errors": self.errors[-5:] if self.errors else [],
+            "recent_errors": list(self.errors[-5:]),
         }
 
 
+@dataclass
+class DaemonMetrics(_MetricsView):
+    """Live metrics for daemon monitoring."""
+    total_calls: int = 0
+    scheduled_calls: int = 0
+    started_calls: int = 0
+    dropped_calls: int = 0
+    inflight_calls: int = 0
+    queue_depth: int = 0
+    target_calls_per_minute: float = 0.0
+    successful_calls: int = 0
+    failed_calls: int = 0
+    total_operations: int = 0
+    total_guardrails: int = 0
+    blocked_guardrails: int = 0
+    total_latency_ms: float = 0
+    max_latency_ms: float = 0
+    batches_completed: int = 0
+    start_time: Optional[datetime] = None
+    last_batch_time: Optional[datetime] = None
+    current_load_profile: str = "normal"
+    errors: List[str] = field(default_factory=list)
+    latency_samples_ms: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def snapshot(self) -> "MetricsSnapshot":
+        """Copy the raw fields so derived values can be computed outside the lock."""
+        return MetricsSnapshot(
+            total_calls=self.total_calls,
+            scheduled_calls=self.scheduled_calls,
+            started_calls=self.started_calls,
+            dropped_calls=self.dropped_calls,
+            inflight_calls=self.inflight_calls,
+            queue_depth=self.queue_depth,
+            target_calls_per_minute=self.target_calls_per_minute,
+            successful_calls=self.successful_calls,
+            failed_calls=self.failed_calls,
+            total_operations=self.total_operations,
+            total_guardrails=self.total_guardrails,
+            blocked_guardrails=self.blocked_guardrails,
+            total_latency_ms=self.total_latency_ms,
+            max_latency_ms=self.max_latency_ms,
+            batches_completed=self.batches_completed,
+            start_time=self.start_time,
+            last_batch_time=self.last_batch_time,
+            current_load_profile=self.current_load_profile,
+            errors=tuple(self.errors[-5:]),
+            latency_samples_ms=tuple(self.latency_samples_ms),
+        )
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot(_MetricsView):
+    """Immutable point-in-time copy of DaemonMetrics."""
+    total_calls: int = 0
+    scheduled_calls: int = 0
+    started_calls: int = 0
+    dropped_calls: int = 0
+    inflight_calls: int = 0
+    queue_depth: int = 0
+    target_calls_per_minute: float = 0.0
+    successful_calls: int = 0
+    failed_calls: int = 0
+    total_operations: int = 0
+    total_guardrails: int = 0
+    blocked_guardrails: int = 0
+    total_latency_ms: float = 0
+    max_latency_ms: float = 0
+    batches_completed: int = 0
+    start_time: Optional[datetime] = None
+    last_batch_time: Optional[datetime] = None
+    current_load_profile: str = "normal"
+    errors: Tuple[str, ...] = ()
+    latency_samples_ms: Tuple[float, ...] = ()
+
+
 class DaemonRunner:
     """
     Continuous simulation daemon for production traffic simulation.
@@ -156,14 +251,11 @@ class DaemonRunner:
     to AI agents, collecting metrics for monitoring and analysis.
     """
 
-    # Blocking indicators for guardrail detection
-    BLOCKING_INDICATORS = [
-        "i cannot", "i can't", "i won't", "i am not able",
-        "unable to", "cannot assist", "not appropriate",
-        "against my guidelines", "ethical guidelines",
-        "not permitted", "inappropriate", "harmful",
-        "illegal", "refuse", "decline",
-    ]
+    # Blocking indicators for guardrail detection (shared with SimulationEngine)
+    BLOCKING_INDICATORS = BLOCKING_INDICATORS
+
+    # Fallback query when no templates exist for an agent type
+    DEFAULT_QUERY = "Can you help me with my request?"
 
     def __init__(
         self,
@@ -183,6 +275,8 @@ class DaemonRunner:
         self.profile = profile
         self.agents: List[CreatedAgent] = agents or []
         self.query_templates: Dict[str, List[str]] = {}
+        # Template string -> placeholder count, filled lazily from `query_templates`
+        self._placeholder_counts: Dict[str, int] = {}
         self.guardrail_tests: Dict[str, List[str]] = {}
 
         self._is_running = False
@@ -198,8 +292,11 @@ class DaemonRunner:
         self._metrics_flush_interval = 5.0
         self._last_metrics_flush = 0.0
         self._metrics_flusher_thread: Optional[threading.Thread] = None
+        self._history_writer: Optional[_HistoryWriter] = None
         self._thread_local = threading.local()
         self._log_lock = threading.Lock()
+        self._log_queue: Queue = Queue(maxsize=_LOG_QUEUE_MAXSIZE)
+        self._log_thread: Optional[threading.Thread] = None
         self._flush_lock = threading.Lock()
         self._task_queue: Optional[Queue] = None
         self._workers: List[threading.Thread] = []
@@ -221,10 +318,16 @@ class DaemonRunner:
             return
 
         self.agents = []
-        with open(self.agents_csv, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
+        with open(self.agents_csv, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            idx = {name: i for i, name in enumerate(header)}
             for row in reader:
-                self.agents.append(CreatedAgent.from_csv_row(row))
+                if not row:
+                    continue
+                self.agents.append(CreatedAgent.from_csv_row_tuple(row, idx))
 
     def _get_batch_size(self, config: DaemonConfig) -> int:
         """Get batch size with bounded randomness."""
@@ -241,17 +344,21 @@ class DaemonRunner:
 
     def _generate_query(self, agent_type: str) -> str:
         """Generate a query for the given agent type."""
-        if agent_type not in self.query_templates:
-            return "Can you help me with my request?"
-
-        template = random.choice(self.query_templates[agent_type])
-
-        if '{}' in template:
-            placeholders = template.count('{}')
-            random_values = [str(random.randint(1000, 9999)) for _ in range(placeholders)]
-            return template.format(*random_values)
-
-        return template
+        templates = self.query_templates.get(agent_type)
+        if not templates:
+            return self.DEFAULT_QUERY
+
+        template = random.choice(templates)
+        # Count each template's placeholders once; reading `query_templates` on
+        # every call keeps later reassignments or edits in effect.
+        placeholders = self._placeholder_counts.get(template)
+        if placeholders is None:
+            placeholders = self._placeholder_counts[template] = template.count('{}')
+        if placeholders == 0:
+            return template
+
+        random_values = [str(random.randint(1000, 9999)) for _ in range(placeholders)]
+        return template.format(*random_values)
 
     def _generate_guardrail_query(self) -> tuple:
         """Generate a guardrail test query."""
@@ -268,31 +375,20 @@ class DaemonRunner:
 
     def _is_blocked(self, response_text: str, error_message: str) -> tuple:
         """Determine if a guardrail test was blocked."""
-        if error_message:
-            error_lower = error_message.lower()
-            if any(ind in error_lower for ind in ['content', 'filter', 'policy', 'safety', 'blocked']):
-                return True, True
-
-        if response_text:
-            response_lower = response_text.lower()
-            for indicator in self.BLOCKING_INDICATORS:
-                if indicator in response_lower:
-                    return True, False
-
-        return False, False
+        return is_blocked_response(response_text, error_message)
 
     def _call_agent(self, agent: CreatedAgent, query: str, openai_client) -> Dict[str, Any]:
         """Call an agent and return the result."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         success = False
         error_message = None
         response_text = None
         response_length = 0
 
         try:
-            conversation = openai_client.conversations.create()
+            conversation_id = self._get_conversation_id(agent, openai_client)
             response = openai_client.responses.create(
-                conversation=conversation.id,
+                conversation=conversation_id,
                 extra_body={"agent": {"name": agent.name, "type": "agent_reference"}},
                 input=query,
             )
@@ -302,8 +398,10 @@ class DaemonRunner:
 
         except Exception as e:
             error_message = str(e)
+            # Drop the cached conversation so the next call starts from a fresh one.
+            self._discard_conversation_id(agent)
 
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter() - start_time) * 1000.0
 
         return {
             "response_text": response_text,
@@ -313,6 +411,32 @@ class DaemonRunner:
             "error_message": error_message,
         }
 
+    def _get_conversation_id(self, agent: CreatedAgent, openai_client) -> str:
+        """Return a conversation id, reusing the worker thread's one for this agent when enabled."""
+        config = self._active_config
+        if not getattr(config, "reuse_conversation", False):
+            return openai_client.conversations.create().id
+
+        conversations = getattr(self._thread_local, "conversations", None)
+        if conversations is None:
+            conversations = {}
+            self._thread_local.conversations = conversations
+        # agent name -> [conversation id, calls made on it]
+        entry = conversations.get(agent.name)
+        max_turns = max(1, getattr(config, "conversation_max_turns", 10))
+        if entry is None or entry[1] >= max_turns:
+            # Rotate so the conversation's history (and prompt size) stays bounded
+            entry = [openai_client.conversations.create().id, 0]
+            conversations[agent.name] = entry
+        entry[1] += 1
+        return entry[0]
+
+    def _discard_conversation_id(self, agent: CreatedAgent) -> None:
+        """Forget the cached conversation for an agent on the current thread."""
+        conversations = getattr(self._thread_local, "conversations", None)
+        if conversations:
+            conversations.pop(agent.name, None)
+
     def _get_openai_client(self):
         """Get a per-thread OpenAI client to avoid shared-client threading issues."""
         client = getattr(self._thread_local, "openai_client", None)
@@ -322,15 +446,74 @@ class DaemonRunner:
         return client
 
     def _log(self, message: str) -> None:
-        """Log a message through the callback."""
-        if self._log_callback:
-            with self._log_lock:
-                self._log_callback(message)
-
-    def _update_metrics(self, metrics_dict: Dict) -> None:
-        """Update metrics through the callback."""
-        if self._metrics_callback:
-            self._metrics_callback(metrics_dict)
+        """Log a message through the callback (queued when the log drainer is running)."""
+        if not self._log_callback:
+            return
+        if self._log_thread is not None and self._log_thread.is_alive():
+            try:
+                self._log_queue.put_nowait(message)
+            except Full:
+                # A stalled consumer must not slow workers down; drop the message.
+                pass
+            return
+        with self._log_lock:
+            self._log_callback(message)
+
+    def _log_drainer_loop(self) -> None:
+        """Deliver queued log messages to the callback until the stop sentinel arrives."""
+        while True:
+            message = self._log_queue.get()
+            if message is _LOG_STOP:
+                break
+            callback = self._log_callback
+            if callback is None:
+                continue
+            try:
+                with self._log_lock:
+                    callback(message)
+            except Exception:
+                # Logging is best-effort; a failing callback must not kill the drainer.
+                pass
+
+    def _start_log_drainer(self) -> None:
+        """Start the thread that calls the log callback off the worker threads."""
+        if self._log_thread and self._log_thread.is_alive():
+            return
+        self._log_queue = Queue(maxsize=_LOG_QUEUE_MAXSIZE)
+        self._log_thread = threading.Thread(
+            target=self._log_drainer_loop,
+            daemon=True,
+            name="daemon-logger",
+        )
+        self._log_thread.start()
+
+    def _stop_log_drainer(self, timeout: float = 2.0) -> None:
+        """Drain pending log messages and stop the logger thread."""
+        thread = self._log_thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._log_queue.put(_LOG_STOP, timeout=timeout)
+        except Full:
+            return
+        if thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _run_daemon(self, config: DaemonConfig) -> None:
+        """Run the daemon loop with log delivery on a dedicated thread."""
+        self._start_log_drainer()
+        try:
+            self._daemon_loop(config)
+        finally:
+            self._stop_log_drainer()
+
+    def _update_metrics(self) -> None:
+        """Push a metrics snapshot to the callback and flush to disk when due."""
+        # The snapshot (lock + latency-sample copy) is only built when someone
+        # is listening; this runs after every task.
+        callback = self._metrics_callback
+        if callback is not None:
+            callback(self.get_metrics())
         self._maybe_flush_metrics()
 
     def _maybe_flush_metrics(self, force: bool = False) -> None:
@@ -493,7 +676,7 @@ class DaemonRunner:
                 f"[SCHED] Window {window_number}: plan {operations_count} ops, {guardrails_count} guardrails "
                 f"over {interval_s:.1f}s (target {target_rpm:.1f}/min) queue={self._task_queue.qsize() if self._task_queue else 0}"
             )
-            self._update_metrics(self._metrics.to_dict())
+            self._update_metrics()
 
             spacing_s = interval_s / planned_calls
             min_spacing_s = max(0.0, float(getattr(config, "delay", 0.0) or 0.0))
@@ -582,7 +765,7 @@ class DaemonRunner:
                     self._task_queue.task_done()
                 except Exception:
                     pass
-                self._update_metrics(self._metrics.to_dict())
+                self._update_metrics()
 
     def _daemon_loop(self, config: DaemonConfig) -> None:
         """Main daemon loop."""
@@ -652,11 +835,12 @@ class DaemonRunner:
             if worker.is_alive():
                 worker.join(timeout=0.5)
         self._maybe_flush_metrics(force=True)
+        with self._flush_lock:
+            self._close_history_writer()
         self._log("[DAEMON] Stopped")
 
     def _save_metrics(self, output_dir: str) -> None:
         """Save current metrics to file."""
-        import json
         import tempfile
         metrics_file = os.path.join(output_dir, "daemon_metrics.json")
         history_file = os.path.join(output_dir, "daemon_history.jsonl")
@@ -664,24 +848,26 @@ class DaemonRunner:
             # Keep queue metrics fresh even if the UI only reads the metrics file.
             if self._task_queue is not None:
                 self._metrics.queue_depth = int(self._task_queue.qsize() or 0)
-            metrics_dict = self._metrics.to_dict()
-            metrics_dict["saved_at"] = datetime.now().isoformat()
-            metrics_dict["pid"] = os.getpid()
-            metrics_dict["start_time"] = (
-                self._metrics.start_time.isoformat() if self._metrics.start_time else None
-            )
-            metrics_dict["last_batch_time"] = (
-                self._metrics.last_batch_time.isoformat() if self._metrics.last_batch_time else None
-            )
+            snapshot = self._metrics.snapshot()
+            saved_at = iso_now_fast()
             sample = {
-                "timestamp": metrics_dict["saved_at"],
-                "total_calls": self._metrics.total_calls,
-                "total_operations": self._metrics.total_operations,
-                "total_guardrails": self._metrics.total_guardrails,
+                "timestamp": saved_at,
+                "total_calls": snapshot.total_calls,
+                "total_operations": snapshot.total_operations,
+                "total_guardrails": snapshot.total_guardrails,
             }
             self._metrics_history.append(sample)
             self._metrics_history = self._metrics_history[-self._metrics_history_max:]
-            metrics_dict["history"] = list(self._metrics_history)
+            history = list(self._metrics_history)
+
+        metrics_dict = snapshot.to_dict()
+        metrics_dict["saved_at"] = saved_at
+        metrics_dict["pid"] = os.getpid()
+        metrics_dict["start_time"] = snapshot.start_time.isoformat() if snapshot.start_time else None
+        metrics_dict["last_batch_time"] = (
+            snapshot.last_batch_time.isoformat() if snapshot.last_batch_time else None
+        )
+        metrics_dict["history"] = history
 
         os.makedirs(output_dir, exist_ok=True)
         with tempfile.NamedTemporaryFile("w", delete=False, dir=output_dir) as tmp:
@@ -692,12 +878,25 @@ class DaemonRunner:
 
         # Append-only history for long-running runs (survives process restarts)
         try:
-            with open(history_file, "a", encoding="utf-8") as handle:
-                handle.write(json.dumps(sample) + "\n")
+            if self._history_writer is None or self._history_writer.path != history_file:
+                self._close_history_writer()
+                self._history_writer = _HistoryWriter(history_file)
+            self._history_writer.append(sample)
         except Exception:
             # History is best-effort; daemon should not fail if the append can't happen.
             pass
 
+    def _close_history_writer(self) -> None:
+        """Sync history samples to disk and release the file descriptor."""
+        writer = self._history_writer
+        self._history_writer = None
+        if writer is None:
+            return
+        try:
+            writer.close()
+        except Exception:
+            pass
+
     def _start_metrics_flusher(self) -> None:
         """Start a small heartbeat thread that flushes metrics even if calls are blocked."""
         if self._metrics_flusher_thread and self._metrics_flusher_thread.is_alive():
@@ -750,7 +949,7 @@ class DaemonRunner:
         self._last_metrics_flush = 0.0
 
         self._daemon_thread = threading.Thread(
-            target=self._daemon_loop,
+            target=self._run_daemon,
             args=(config,),
             daemon=True,
         )
@@ -779,7 +978,7 @@ class DaemonRunner:
         self._metrics.start_time = datetime.now()
         self._metrics_history = []
         self._last_metrics_flush = 0.0
-        self._daemon_loop(config)
+        self._run_daemon(config)
 
     def stop(self) -> None:
         """Stop the daemon."""
@@ -788,6 +987,10 @@ class DaemonRunner:
             self._daemon_thread.join(timeout=5)
         if self._metrics_flusher_thread and self._metrics_flusher_thread.is_alive():
             self._metrics_flusher_thread.join(timeout=2)
+        if self._log_thread and self._log_thread.is_alive():
+            self._log_thread.join(timeout=2)
+        with self._flush_lock:
+            self._close_history_writer()
         self._is_running = False
 
     def request_stop(self) -> None:
@@ -802,7 +1005,8 @@ class DaemonRunner:
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics snapshot."""
         with self._metrics_lock:
-            return self._metrics.to_dict()
+            snapshot = self._metrics.snapshot()
+        return snapshot.to_dict()
 
     def get_agent_count(self) -> int:
         """Get number of loaded agents."""
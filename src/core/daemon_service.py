@@ -8,28 +8,43 @@ daemon can persist beyond the UI lifecycle.
 from __future__ import annotations
 
 import json
+import mmap
+import operator
 import os
-import signal
-import subprocess
+import select
 import sys
 import time
-from dataclasses import asdict
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from src.core import config
 from src.core.daemon_runner import DaemonRunner, DaemonConfig
+from src.core.response_utils import iso_now_fast
 from src.models.agent import CreatedAgent
-from src.templates.template_loader import TemplateLoader
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-def _read_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
+# orjson parses bytes directly and is several times faster than the stdlib.
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Agent fields persisted in daemon state; the getter runs in C.
+_AGENT_FIELDS = ("agent_id", "name", "azure_id", "version", "model", "org_id", "agent_type")
+_get_agent_fields = operator.attrgetter(*_AGENT_FIELDS)
+_REQUIRED_AGENT_FIELDS = frozenset(
+    name for name, field in CreatedAgent.model_fields.items() if field.is_required()
+)
+
+# How long a placeholder pidfile (PID 0) is treated as a start still in progress.
+_PIDFILE_CLAIM_GRACE_S = 30.0
+
+
+def _read_json(path: Union[str, Path]) -> Dict[str, Any]:
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        with open(path, "rb") as handle:
+            return _loads(handle.read())
     except Exception:
         return {}
 
@@ -37,36 +52,70 @@ def _read_json(path: Path) -> Dict[str, Any]:
 def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(path.suffix + ".tmp")
-    with tmp_path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
-        handle.write("\n")
-    tmp_path.replace(path)
+    if orjson is not None:
+        buf = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        buf = (json.dumps(payload, indent=2) + "\n").encode("utf-8")
+
+    # fsync the data before the rename, then the directory, so a crash can never
+    # leave the final path pointing at an empty or partial file.
+    fd = os.open(os.fspath(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(buf)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        dir_fd = os.open(os.fspath(directory), os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+# Linux with procfs mounted: process state can be read from /proc/<pid>/stat.
+_HAS_PROC = sys.platform.startswith("linux") and os.path.isdir("/proc/self")
 
 
 def _linux_process_state(pid: int) -> Optional[str]:
-    stat_path = Path(f"/proc/{pid}/stat")
     try:
-        data = stat_path.read_text(encoding="utf-8")
-    except FileNotFoundError:
+        fd = os.open(f"/proc/{pid}/stat", os.O_RDONLY)
+    except OSError:
         return None
-    except Exception:
+    try:
+        data = os.read(fd, 512)
+    except OSError:
         return None
+    finally:
+        os.close(fd)
 
-    end = data.rfind(")")
-    if end == -1:
+    # /proc/<pid>/stat is ASCII; the state letter follows the ") " that closes the comm field.
+    end = data.rfind(b")")
+    if end < 0 or end + 2 >= len(data):
         return None
-    idx = end + 2
-    if idx >= len(data):
-        return None
-    return data[idx]
+    return chr(data[end + 2])
 
 
 def _pid_is_zombie(pid: int) -> bool:
     if pid <= 0:
         return False
-    if sys.platform.startswith("linux"):
+    if _HAS_PROC:
         state = _linux_process_state(pid)
-        return state in {"Z", "X"}
+        return state == "Z" or state == "X"
     return False
 
 
@@ -85,8 +134,10 @@ def _try_reap_pid(pid: int) -> bool:
 def _pid_is_running(pid: int) -> bool:
     if pid <= 0:
         return False
-    if _pid_is_zombie(pid):
-        return False
+    if _HAS_PROC:
+        # One /proc read answers both "exists?" and "zombie?" without a kill(0) probe.
+        state = _linux_process_state(pid)
+        return state is not None and state != "Z" and state != "X"
     try:
         os.kill(pid, 0)
     except OSError:
@@ -94,6 +145,33 @@ def _pid_is_running(pid: int) -> bool:
     return True
 
 
+def _wait_for_exit(pid: int, timeout: float) -> bool:
+    """Wait up to `timeout` seconds for `pid` to exit; return True once it is gone."""
+    if hasattr(os, "pidfd_open") and sys.platform.startswith("linux"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            fd = None
+        if fd is not None:
+            try:
+                # The pidfd becomes readable as soon as the process terminates.
+                readable, _, _ = select.select([fd], [], [], max(0.0, timeout))
+            finally:
+                os.close(fd)
+            return bool(readable) or not _pid_is_running(pid)
+
+    deadline = time.time() + timeout
+    while True:
+        if not _pid_is_running(pid):
+            return True
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        time.sleep(min(0.2, remaining))
+
+
 class DaemonService:
     """Manage the long-running daemon as a background process."""
 
@@ -108,113 +186,206 @@ class DaemonService:
         self.history_path = self.daemon_dir / "daemon_history.jsonl"
         self.pid_path = self.daemon_dir / "daemon.pid"
         self.log_path = self.daemon_dir / "daemon.log"
+        # The paths never change, so convert them to str once for the polling hot path.
+        self._state_path_str = os.fspath(self.state_path)
+        self._metrics_path_str = os.fspath(self.metrics_path)
+        self._history_path_str = os.fspath(self.history_path)
+        self._pid_path_str = os.fspath(self.pid_path)
+        # (stat signature, parsed payload) caches for the JSON files the UI polls.
+        self._state_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+        self._metrics_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+
+    def _cached_read(self, path: str, attr: str) -> Dict[str, Any]:
+        """Read a JSON file, reusing the last parse while its stat signature is unchanged."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            setattr(self, attr, None)
+            return {}
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = getattr(self, attr, None)
+        if cached is not None and cached[0] == sig:
+            return dict(cached[1])
+        data = _read_json(path)
+        setattr(self, attr, (sig, data) if data else None)
+        return dict(data)
+
+    def _read_pidfile(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Return (pid, claimant) from the pidfile.
+
+        A start in progress writes a placeholder PID 0 followed by the PID of the
+        process that claimed the file; for a real PID the claimant is None.
+        """
+        try:
+            fd = os.open(self._pid_path_str, os.O_RDONLY)
+        except OSError:
+            return None, None
+        try:
+            fields = os.read(fd, 64).split()
+            pid = int(fields[0])
+            claimant = int(fields[1]) if pid == 0 and len(fields) > 1 else None
+            return pid, claimant
+        except (ValueError, IndexError, OSError):
+            return None, None
+        finally:
+            os.close(fd)
 
     def _read_pid(self) -> Optional[int]:
-        if not self.pid_path.exists():
-            return None
-        try:
-            return int(self.pid_path.read_text(encoding="utf-8").strip())
-        except Exception:
-            return None
+        return self._read_pidfile()[0]
 
     def _write_pid(self, pid: int) -> None:
-        self.pid_path.write_text(str(pid), encoding="utf-8")
+        fd = os.open(self._pid_path_str, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, str(pid).encode("ascii"))
+        finally:
+            os.close(fd)
+
+    def _claim_pidfile(self) -> bool:
+        """
+        Atomically create the pidfile with a placeholder PID and the claimant's PID.
+
+        Returns False if another live daemon (or a start still in progress) owns it.
+        A stale pidfile, including a placeholder whose claimant has exited, is
+        removed and the claim retried once.
+        """
+        for _ in range(2):
+            try:
+                fd = os.open(self._pid_path_str, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                try:
+                    judged = os.stat(self._pid_path_str)
+                except FileNotFoundError:
+                    continue
+                pid, claimant = self._read_pidfile()
+                if pid:
+                    if _pid_is_running(pid):
+                        return False
+                    if _pid_is_zombie(pid):
+                        _try_reap_pid(pid)
+                elif claimant is None or _pid_is_running(claimant):
+                    # Claimant alive (or not recorded yet): honour the grace window.
+                    if time.time() - judged.st_mtime < _PIDFILE_CLAIM_GRACE_S:
+                        return False
+                # Only remove the file judged stale: another starter may have
+                # reclaimed it (or a daemon written its PID) in the meantime.
+                try:
+                    current = os.stat(self._pid_path_str)
+                except FileNotFoundError:
+                    continue
+                if (current.st_ino, current.st_mtime_ns) != (judged.st_ino, judged.st_mtime_ns):
+                    continue
+                try:
+                    os.unlink(self._pid_path_str)
+                except FileNotFoundError:
+                    pass
+                continue
+            try:
+                os.write(fd, f"0\n{os.getpid()}".encode("ascii"))
+            finally:
+                os.close(fd)
+            return True
+        return False
+
+    def _claim_wait_message(self) -> str:
+        """Explain why a start could not claim the pidfile."""
+        pid, claimant = self._read_pidfile()
+        if pid == 0:
+            try:
+                age = time.time() - os.stat(self._pid_path_str).st_mtime
+            except FileNotFoundError:
+                age = 0.0
+            owner = f" by PID {claimant}" if claimant else ""
+            remaining = max(0.0, _PIDFILE_CLAIM_GRACE_S - age)
+            return (
+                f"Daemon start already in progress (claimed{owner}); "
+                f"retry in {remaining:.0f}s if it does not come up"
+            )
+        return "Daemon already running"
 
     def _clear_pid(self) -> None:
-        if self.pid_path.exists():
-            self.pid_path.unlink()
+        self.pid_path.unlink(missing_ok=True)
 
     def _mark_stopped(self) -> None:
         state = self.read_state()
         if not state:
             return
         state["pid"] = 0
-        state["stopped_at"] = datetime.now().isoformat()
+        state["stopped_at"] = iso_now_fast()
         _write_json_atomic(self.state_path, state)
+        self._state_cache = None
 
-    def is_running(self) -> bool:
+    def _candidate_pids(self) -> Iterator[Tuple[int, str]]:
+        """Yield (pid, source) candidates: the pidfile first, then metrics and state JSON."""
         pid = self._read_pid()
         if pid:
+            yield pid, "pidfile"
+        for source, payload in (("metrics", self.read_metrics()), ("state", self.read_state())):
+            candidate = int(payload.get("pid", 0) or 0) if payload else 0
+            if candidate:
+                yield candidate, source
+
+    def _resolve_live_pid(self, stale: Optional[List[int]] = None) -> Optional[int]:
+        """
+        Return the PID of the running daemon, adopting it into the pidfile if needed.
+
+        Dead candidates are reaped when they are zombies and, if `stale` is given,
+        appended to it so callers can tell "never started" from "already exited".
+        """
+        for pid, source in self._candidate_pids():
             if _pid_is_running(pid):
-                return True
+                if source != "pidfile":
+                    self._write_pid(pid)
+                return pid
             if _pid_is_zombie(pid):
                 _try_reap_pid(pid)
-            self._clear_pid()
-
-        metrics = self.read_metrics()
-        metrics_pid = int(metrics.get("pid", 0) or 0) if metrics else 0
-        if metrics_pid:
-            if _pid_is_running(metrics_pid):
-                self._write_pid(metrics_pid)
-                return True
-            if _pid_is_zombie(metrics_pid):
-                _try_reap_pid(metrics_pid)
+            if source == "pidfile":
+                self._clear_pid()
+            if stale is not None:
+                stale.append(pid)
+        return None
 
-        state = self.read_state()
-        state_pid = int(state.get("pid", 0) or 0) if state else 0
-        if state_pid:
-            if _pid_is_running(state_pid):
-                self._write_pid(state_pid)
-                return True
-            if _pid_is_zombie(state_pid):
-                _try_reap_pid(state_pid)
-        return False
+    def is_running(self) -> bool:
+        return self._resolve_live_pid() is not None
 
     def read_metrics(self) -> Dict[str, Any]:
-        return _read_json(self.metrics_path)
+        return self._cached_read(self._metrics_path_str, "_metrics_cache")
 
     def read_history(self, limit: int = 120) -> List[Dict[str, Any]]:
         """Read the last N history samples from the append-only JSONL history file."""
-        path = self.history_path
-        if not path.exists():
-            return []
-
-        # Tail the file without reading it all (can be huge for long-running runs).
+        # Tail the file without reading it all (can be huge for long-running runs):
+        # map it and walk newlines backwards so only the last `limit` lines are touched.
+        out: List[Dict[str, Any]] = []
         try:
-            with path.open("rb") as handle:
-                handle.seek(0, os.SEEK_END)
-                end = handle.tell()
-                block = 8192
-                data = b""
-                lines: List[bytes] = []
-                while end > 0 and len(lines) <= limit:
-                    read_size = block if end >= block else end
-                    end -= read_size
-                    handle.seek(end)
-                    data = handle.read(read_size) + data
-                    lines = data.splitlines()
-                    if end == 0:
-                        break
-                tail = lines[-limit:]
+            with open(self._history_path_str, "rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if size == 0 or limit <= 0:
+                    return []
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = size
+                    spans: List[Tuple[int, int]] = []
+                    while end > 0 and len(spans) < limit:
+                        newline = mm.rfind(b"\n", 0, end)
+                        start = newline + 1
+                        if mm[start:end].strip():
+                            spans.append((start, end))
+                        if newline < 0:
+                            break
+                        end = newline
+                    for start, end in reversed(spans):
+                        try:
+                            out.append(_loads(mm[start:end]))
+                        except Exception:
+                            continue
         except Exception:
             return []
-
-        out: List[Dict[str, Any]] = []
-        for raw in tail:
-            try:
-                out.append(json.loads(raw.decode("utf-8")))
-            except Exception:
-                continue
         return out
 
     def read_state(self) -> Dict[str, Any]:
-        return _read_json(self.state_path)
+        return self._cached_read(self._state_path_str, "_state_cache")
 
     def _serialize_agents(self, agents: List[CreatedAgent]) -> List[Dict[str, Any]]:
-        serialized = []
-        for agent in agents:
-            serialized.append(
-                {
-                    "agent_id": agent.agent_id,
-                    "name": agent.name,
-                    "azure_id": agent.azure_id,
-                    "version": agent.version,
-                    "model": agent.model,
-                    "org_id": agent.org_id,
-                    "agent_type": agent.agent_type,
-                }
-            )
-        return serialized
+        return [dict(zip(_AGENT_FIELDS, _get_agent_fields(agent))) for agent in agents]
 
     def start(
         self,
@@ -223,73 +394,73 @@ class DaemonService:
         profile_id: str,
         profile_name: str,
     ) -> Tuple[bool, str]:
-        if self.is_running():
-            return False, "Daemon already running"
+        # Imported lazily: status polling (is_running/read_*) never needs these.
+        import subprocess
+        from dataclasses import asdict
+
         if not agents:
             return False, "No agents selected"
+        if not self._claim_pidfile():
+            return False, self._claim_wait_message()
+        # The pidfile may have been lost while a daemon recorded in metrics/state is still alive.
+        if self._resolve_live_pid() is not None:
+            return False, "Daemon already running"
 
-        daemon_config.output_dir = str(self.daemon_dir)
-        state = {
-            "started_at": datetime.now().isoformat(),
-            "profile_id": profile_id,
-            "profile_name": profile_name,
-            "config": asdict(daemon_config),
-            "agents": self._serialize_agents(agents),
-        }
-        _write_json_atomic(self.state_path, state)
-
-        cmd = [
-            sys.executable,
-            "-m",
-            "src.core.daemon_service",
-            "run",
-            "--state",
-            str(self.state_path),
-        ]
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        log_handle = self.log_path.open("a", encoding="utf-8")
+        # Until the real PID is written, any failure must release the claim;
+        # otherwise the placeholder blocks later starts for the grace window.
         try:
-            proc = subprocess.Popen(
-                cmd,
-                cwd=self.repo_root,
-                stdout=log_handle,
-                stderr=log_handle,
-                start_new_session=True,
-            )
-        except Exception as exc:
-            log_handle.close()
-            return False, f"Failed to start daemon: {exc}"
+            daemon_config.output_dir = str(self.daemon_dir)
+            state = {
+                "started_at": iso_now_fast(),
+                "profile_id": profile_id,
+                "profile_name": profile_name,
+                "config": asdict(daemon_config),
+                "agents": self._serialize_agents(agents),
+            }
+            _write_json_atomic(self.state_path, state)
+            self._state_cache = None
+
+            cmd = [
+                sys.executable,
+                "-m",
+                "src.core.daemon_service",
+                "run",
+                "--state",
+                str(self.state_path),
+            ]
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            log_handle = self.log_path.open("a", encoding="utf-8")
+            try:
+                proc = subprocess.Popen(
+                    cmd,
+                    cwd=self.repo_root,
+                    stdout=log_handle,
+                    stderr=log_handle,
+                    start_new_session=True,
+                )
+            except Exception as exc:
+                log_handle.close()
+                self._clear_pid()
+                return False, f"Failed to start daemon: {exc}"
 
-        log_handle.close()
-        self._write_pid(proc.pid)
+            log_handle.close()
+            self._write_pid(proc.pid)
+        except BaseException:
+            self._clear_pid()
+            raise
         state["pid"] = proc.pid
         _write_json_atomic(self.state_path, state)
+        self._state_cache = None
         return True, "Daemon started"
 
     def stop(self, timeout: float = 5.0) -> Tuple[bool, str]:
-        pid = self._read_pid()
-        if not pid:
-            metrics = self.read_metrics()
-            metrics_pid = int(metrics.get("pid", 0) or 0) if metrics else 0
-            state = self.read_state()
-            state_pid = int(state.get("pid", 0) or 0) if state else 0
-            if metrics_pid and _pid_is_running(metrics_pid):
-                pid = metrics_pid
-            elif state_pid and _pid_is_running(state_pid):
-                pid = state_pid
-            elif metrics_pid and _pid_is_zombie(metrics_pid):
-                pid = metrics_pid
-            elif state_pid and _pid_is_zombie(state_pid):
-                pid = state_pid
-            else:
-                pid = metrics_pid or state_pid
-            if pid:
-                self._write_pid(pid)
-            else:
+        import signal
+
+        stale: List[int] = []
+        pid = self._resolve_live_pid(stale)
+        if pid is None:
+            if not stale:
                 return False, "Daemon is not running"
-        if not _pid_is_running(pid):
-            if _pid_is_zombie(pid):
-                _try_reap_pid(pid)
             self._clear_pid()
             self._mark_stopped()
             return True, "Daemon stopped"
@@ -299,22 +470,18 @@ class DaemonService:
         except Exception as exc:
             return False, f"Failed to stop daemon: {exc}"
 
-        start = time.time()
-        while time.time() - start < timeout:
-            if not _pid_is_running(pid):
-                _try_reap_pid(pid)
-                self._clear_pid()
-                self._mark_stopped()
-                return True, "Daemon stopped"
-            time.sleep(0.2)
+        if _wait_for_exit(pid, timeout):
+            _try_reap_pid(pid)
+            self._clear_pid()
+            self._mark_stopped()
+            return True, "Daemon stopped"
 
         try:
             os.kill(pid, signal.SIGKILL)
         except Exception as exc:
             return False, f"Timed out stopping daemon: {exc}"
 
-        time.sleep(0.2)
-        if not _pid_is_running(pid):
+        if _wait_for_exit(pid, 0.2):
             _try_reap_pid(pid)
             self._clear_pid()
             self._mark_stopped()
@@ -324,10 +491,16 @@ class DaemonService:
 
 
 def _load_agents(agent_rows: List[Dict[str, Any]]) -> List[CreatedAgent]:
+    # CreatedAgent is a pydantic model (keyword-only), so validate the row mapping
+    # directly instead of re-packing it as **kwargs; rows missing required keys are
+    # skipped up front without paying for a validation error.
+    validate = CreatedAgent.model_validate
     agents: List[CreatedAgent] = []
     for row in agent_rows:
+        if not isinstance(row, dict) or not _REQUIRED_AGENT_FIELDS.issubset(row):
+            continue
         try:
-            agents.append(CreatedAgent(**row))
+            agents.append(validate(row))
         except Exception:
             continue
     return agents
@@ -335,6 +508,11 @@ def _load_agents(agent_rows: List[Dict[str, Any]]) -> List[CreatedAgent]:
 
 def run_daemon(state_path: Path) -> int:
     """Run the daemon loop in the foreground for background process execution."""
+    import signal
+    from dataclasses import fields
+
+    from src.templates.template_loader import TemplateLoader
+
     service = DaemonService()
     state = _read_json(state_path)
     if not state:
@@ -357,7 +535,6 @@ def run_daemon(state_path: Path) -> int:
 
     config_data = state.get("config", {})
     # Allow old/new daemon state JSON to be read across versions.
-    from dataclasses import fields
     allowed = {f.name for f in fields(DaemonConfig)}
     filtered = {k: v for k, v in (config_data or {}).items() if k in allowed}
     daemon_config = DaemonConfig(**filtered)
@@ -389,7 +566,7 @@ def run_daemon(state_path: Path) -> int:
         state = _read_json(state_path)
         if state:
             state["pid"] = 0
-            state["stopped_at"] = datetime.now().isoformat()
+            state["stopped_at"] = iso_now_fast()
             _write_json_atomic(state_path, state)
 
     return 0
@@ -4,6 +4,7 @@ Environment validation for Microsoft Foundry Agent Toolkit.
 Validates required environment variables and provides setup guidance.
 """
 
+import functools
 import os
 from pathlib import Path
 from typing import Tuple, Optional
@@ -19,6 +20,39 @@ class EnvValidationResult:
     setup_guide: str = ""
 
 
+@functools.lru_cache(maxsize=4)
+def _setup_guide_text(env_exists: bool, example_exists: bool) -> str:
+    """Setup guide text; it only varies with which .env files exist."""
+    if not env_exists:
+        if example_exists:
+            create_step = (
+                "1. Create a .env file in the project root\n"
+                "   You can copy from .env.example:\n"
+                "   $ cp .env.example .env\n\n"
+            )
+        else:
+            create_step = "1. Create a .env file in the project root\n   $ touch .env\n\n"
+    else:
+        create_step = "1. Your .env file exists but needs configuration\n\n"
+
+    return (
+        "Setup Guide:\n\n"
+        f"{create_step}"
+        "2. Sign in with Azure CLI to enable credentials:\n"
+        "   $ az login\n\n"
+        "3. Add your Microsoft Foundry project endpoint:\n"
+        "   PROJECT_ENDPOINT=https://your-project.services.ai.azure.com/api/projects/your-project\n\n"
+        "4. How to find your project endpoint:\n"
+        "   a) Go to https://ai.azure.com\n"
+        "   b) Open your AI Foundry project\n"
+        "   c) Go to Settings → Project details\n"
+        "   d) Copy the 'Project endpoint' URL\n\n"
+        "5. Required format:\n"
+        "   PROJECT_ENDPOINT=https://[your-project].services.ai.azure.com/api/projects/[project-id]\n\n"
+        "6. Save the .env file and restart the application\n"
+    )
+
+
 class EnvValidator:
     """Validates environment configuration."""
 
@@ -31,27 +65,48 @@ class EnvValidator:
         """
         Validate that all required environment variables are set.
 
+        The checks are memoized on the current variable values (and, when something
+        is missing, on whether the .env files exist), so repeated calls are cheap;
+        each call still gets its own result object.
+
         Returns:
             EnvValidationResult with validation status and guidance
         """
-        missing_vars = []
-
-        for var in cls.REQUIRED_VARS:
-            value = os.getenv(var)
-            if not value or value.strip() == "":
-                missing_vars.append(var)
-
-        if missing_vars:
-            error_msg = cls._build_error_message(missing_vars)
-            setup_guide = cls._build_setup_guide()
-            return EnvValidationResult(
-                is_valid=False,
-                missing_vars=missing_vars,
-                error_message=error_msg,
-                setup_guide=setup_guide
-            )
-
-        return EnvValidationResult(is_valid=True, missing_vars=[])
+        values = tuple(os.getenv(var) or "" for var in cls.REQUIRED_VARS)
+        if all(value.strip() for value in values):
+            file_state = None
+        else:
+            file_state = (cls.ENV_FILE.exists(), cls.ENV_EXAMPLE_FILE.exists())
+        missing_vars, error_message, setup_guide = cls._validate_cached(
+            tuple(cls.REQUIRED_VARS), values, file_state
+        )
+        if not missing_vars:
+            return EnvValidationResult(is_valid=True, missing_vars=[])
+        return EnvValidationResult(
+            is_valid=False,
+            missing_vars=list(missing_vars),
+            error_message=error_message,
+            setup_guide=setup_guide,
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _validate_cached(
+        required_vars: Tuple[str, ...],
+        values: Tuple[str, ...],
+        file_state: Optional[Tuple[bool, bool]],
+    ) -> Tuple[Tuple[str, ...], str, str]:
+        """Return (missing vars, error message, setup guide) for the given values."""
+        missing_vars = tuple(var for var, value in zip(required_vars, values) if not value.strip())
+        if not missing_vars:
+            return (), "", ""
+
+        env_exists, example_exists = file_state
+        return (
+            missing_vars,
+            EnvValidator._build_error_message(list(missing_vars)),
+            _setup_guide_text(env_exists, example_exists),
+        )
 
     @classmethod
     def _build_error_message(cls, missing_vars: list) -> str:
@@ -62,39 +117,7 @@ class EnvValidator:
     @classmethod
     def _build_setup_guide(cls) -> str:
         """Build setup guide text."""
-        env_exists = cls.ENV_FILE.exists()
-        example_exists = cls.ENV_EXAMPLE_FILE.exists()
-
-        guide = "Setup Guide:\n\n"
-
-        if not env_exists:
-            guide += "1. Create a .env file in the project root\n"
-            if example_exists:
-                guide += "   You can copy from .env.example:\n"
-                guide += "   $ cp .env.example .env\n\n"
-            else:
-                guide += "   $ touch .env\n\n"
-        else:
-            guide += "1. Your .env file exists but needs configuration\n\n"
-
-        guide += "2. Sign in with Azure CLI to enable credentials:\n"
-        guide += "   $ az login\n\n"
-
-        guide += "3. Add your Microsoft Foundry project endpoint:\n"
-        guide += "   PROJECT_ENDPOINT=https://your-project.services.ai.azure.com/api/projects/your-project\n\n"
-
-        guide += "4. How to find your project endpoint:\n"
-        guide += "   a) Go to https://ai.azure.com\n"
-        guide += "   b) Open your AI Foundry project\n"
-        guide += "   c) Go to Settings → Project details\n"
-        guide += "   d) Copy the 'Project endpoint' URL\n\n"
-
-        guide += "5. Required format:\n"
-        guide += "   PROJECT_ENDPOINT=https://[your-project].services.ai.azure.com/api/projects/[project-id]\n\n"
-
-        guide += "6. Save the .env file and restart the application\n"
-
-        return guide
+        return _setup_guide_text(cls.ENV_FILE.exists(), cls.ENV_EXAMPLE_FILE.exists())
 
     @classmethod
     def update_env_file(cls, project_endpoint: str) -> Tuple[bool, str]:
@@ -115,29 +138,20 @@ class EnvValidator:
             if "services.ai.azure.com" not in project_endpoint:
                 return False, "Invalid endpoint format. Should contain 'services.ai.azure.com'"
 
-            # Read existing .env or create new
-            existing_lines = []
-            if cls.ENV_FILE.exists():
-                with open(cls.ENV_FILE, 'r') as f:
-                    existing_lines = f.readlines()
+            endpoint_line = f"PROJECT_ENDPOINT={project_endpoint}\n"
 
-            # Update or append PROJECT_ENDPOINT
-            updated = False
-            new_lines = []
-
-            for line in existing_lines:
-                if line.strip().startswith("PROJECT_ENDPOINT="):
-                    new_lines.append(f"PROJECT_ENDPOINT={project_endpoint}\n")
-                    updated = True
+            if not cls.ENV_FILE.exists():
+                cls.ENV_FILE.write_text(endpoint_line)
+            else:
+                data = cls.ENV_FILE.read_bytes()
+                if b"PROJECT_ENDPOINT=" not in data:
+                    # Key absent: append instead of rewriting the whole file
+                    with open(cls.ENV_FILE, 'ab') as f:
+                        if data and not data.endswith(b"\n"):
+                            f.write(b"\n")
+                        f.write(endpoint_line.encode())
                 else:
-                    new_lines.append(line)
-
-            if not updated:
-                new_lines.append(f"PROJECT_ENDPOINT={project_endpoint}\n")
-
-            # Write back to file
-            with open(cls.ENV_FILE, 'w') as f:
-                f.writelines(new_lines)
+                    cls._replace_env_key(data.decode().splitlines(keepends=True), endpoint_line)
 
             # Reload environment from .env file
             cls.reload_environment()
@@ -153,6 +167,28 @@ class EnvValidator:
         except Exception as e:
             return False, f"Failed to update .env file: {str(e)}"
 
+    @classmethod
+    def _replace_env_key(cls, existing_lines: list, endpoint_line: str) -> None:
+        """Rewrite .env with PROJECT_ENDPOINT replaced (or appended if only mentioned)."""
+        updated = False
+        new_lines = []
+
+        for line in existing_lines:
+            if line.strip().startswith("PROJECT_ENDPOINT="):
+                new_lines.append(endpoint_line)
+                updated = True
+            else:
+                new_lines.append(line)
+
+        if not updated:
+            if new_lines and not new_lines[-1].endswith("\n"):
+                new_lines[-1] += "\n"
+            new_lines.append(endpoint_line)
+
+        # Write back to file
+        with open(cls.ENV_FILE, 'w') as f:
+            f.writelines(new_lines)
+
     @classmethod
     def _update_azure_client(cls, endpoint: str) -> None:
         """
@@ -194,6 +230,7 @@ class EnvValidator:
             from dotenv import load_dotenv
             # Reload with override=True to update existing variables
             load_dotenv(override=True)
+            cls._validate_cached.cache_clear()
         except Exception as e:
             print(f"Warning: Could not reload environment: {e}")
 
@@ -5,58 +5,56 @@ Creates evaluation groups and runs them against selected agents using
 project-scoped OpenAI evals, then persists run metadata and outputs.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import hashlib
+import itertools
 import json
+import os
+import queue
+import random
 import re
+import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from openai.types.eval_create_params import DataSourceConfigCustom
 
 from .azure_client import get_openai_client, get_project_client
-from .evaluation_templates import EvaluationTemplateLoader, EvaluationTemplate, EvaluationItem, EvaluatorDefinition
+from .evaluation_templates import (
+    EVALUATOR_NAME_MAP,
+    EVALUATOR_SPECS,
+    GROUND_TRUTH_EVALUATORS,
+    MODEL_DEPLOYMENT_EVALUATORS,
+    EvaluationTemplateLoader,
+    EvaluationTemplate,
+    EvaluationItem,
+    EvaluatorDefinition,
+    EvaluatorSpec,
+)
 from .agent_manager import AgentManager
 from . import config
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-EVALUATOR_NAME_MAP = {
-    "bleu_score": "builtin.bleu_score",
-    "coherence": "builtin.coherence",
-    "f1_score": "builtin.f1_score",
-    "fluency": "builtin.fluency",
-    "gleu_score": "builtin.gleu_score",
-    "hate_unfairness": "builtin.hate_unfairness",
-    "meteor_score": "builtin.meteor_score",
-    "prohibited_actions": "builtin.prohibited_actions",
-    "relevance": "builtin.relevance",
-    "response_completeness": "builtin.response_completeness",
-    "rouge_score": "builtin.rouge_score",
-    "self_harm": "builtin.self_harm",
-    "sensitive_data_leakage": "builtin.sensitive_data_leakage",
-    "sexual": "builtin.sexual",
-    "similarity": "builtin.similarity",
-    "violence": "builtin.violence",
-}
 
-MODEL_DEPLOYMENT_EVALUATORS = {
-    "coherence",
-    "fluency",
-    "relevance",
-    "response_completeness",
-    "similarity",
-}
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9-]+")
+_DATA_TEMPLATE_RE = re.compile(r"^\$\{data\.([a-zA-Z0-9_.]+)\}$")
 
-GROUND_TRUTH_EVALUATORS = {
-    "bleu_score",
-    "f1_score",
-    "gleu_score",
-    "meteor_score",
-    "response_completeness",
-    "rouge_score",
-    "similarity",
-}
+# Upper bound for the backoff between eval run status polls.
+_MAX_POLL_INTERVAL_S = 15.0
+
+# How long the project agent listing is reused by _resolve_agents.
+_AGENTS_CACHE_TTL_S = 60.0
+
+# Concurrent evals.create calls when a run covers several templates.
+_MAX_DEFINITION_WORKERS = 8
 
 STRING_CHECK_OPERATION_MAP = {
     "equals": "eq",
@@ -70,7 +68,159 @@ STRING_CHECK_OPERATION_MAP = {
 }
 
 
-@dataclass
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    """Serialize one record as a compact JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _dumps_jsonl(records: List[Dict[str, Any]]) -> bytes:
+    """Serialize records as JSON lines, one compact object per line."""
+    if orjson is not None:
+        return b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records)
+    payload = "\n".join(json.dumps(record, ensure_ascii=True, separators=(",", ":")) for record in records)
+    return (payload + "\n").encode("utf-8") if payload else b""
+
+
+def _dumps_indented(record: Dict[str, Any]) -> bytes:
+    """Serialize a result record as indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, indent=2, ensure_ascii=True).encode("utf-8")
+
+
+def _definition_key(template_id: str, data_source_config: Any, testing_criteria: Any) -> str:
+    """Content hash identifying an eval definition."""
+    content = [template_id, data_source_config, testing_criteria]
+    if orjson is not None:
+        payload = orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(content, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _extract_id(obj: Any) -> Optional[str]:
+    """Return the ``id`` of an SDK response object, or of a plain dict response."""
+    try:
+        return obj.id
+    except AttributeError:
+        return obj.get("id")
+
+
+def _write_bytes_atomic(path: Path, payload: bytes) -> None:
+    """Write a file via a temporary sibling and os.replace so readers never see partial data."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def _write_jsonl_stream_atomic(path: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """Stream records into a JSONL file (atomically replaced) and return how many were written."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    count = 0
+    try:
+        with open(tmp_path, "wb") as handle:
+            for record in records:
+                handle.write(_dumps_line(record))
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def _count_statuses(items: Iterable[Dict[str, Any]], counts: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """Pass items through while tallying their ``status`` values into ``counts``."""
+    for item in items:
+        status = item.get("status") or "unknown"
+        counts[status] = counts.get(status, 0) + 1
+        yield item
+
+
+_WRITER_STOP = object()  # Sentinel that tells the file writer to exit
+_PROGRESS_STOP = object()  # Sentinel that tells the progress dispatcher to exit
+
+
+class _ProgressDispatcher:
+    """Delivers progress updates posted by run threads on a single thread."""
+
+    def __init__(self, callback: Callable[[int, int, str], None]) -> None:
+        self._callback = callback
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="eval-progress")
+        self._thread.start()
+
+    def post(self, step: int, total: int, message: str) -> None:
+        self._queue.put((step, total, message))
+
+    def _loop(self) -> None:
+        while True:
+            update = self._queue.get()
+            if update is _PROGRESS_STOP:
+                break
+            try:
+                self._callback(*update)
+            except Exception:
+                # Progress reporting is best-effort and must not stop the runs.
+                pass
+
+    def close(self) -> None:
+        """Deliver the remaining updates and stop the thread."""
+        self._queue.put(_PROGRESS_STOP)
+        self._thread.join()
+
+
+class _FileWriter:
+    """
+    Background thread that serializes and writes result files.
+
+    Run threads only enqueue ``(path, dumps, value)`` jobs. `close()` waits for
+    every queued write and returns the first write error, if any.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="eval-writer")
+        self._thread.start()
+
+    def submit(self, path: Path, dumps: Callable[[Any], bytes], value: Any) -> None:
+        self._queue.put((path, dumps, value))
+
+    def submit_bytes(self, path: Path, payload: bytes) -> None:
+        self._queue.put((path, None, payload))
+
+    def _loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _WRITER_STOP:
+                break
+            path, dumps, value = job
+            try:
+                _write_bytes_atomic(path, value if dumps is None else dumps(value))
+            except Exception as exc:
+                if self._error is None:
+                    self._error = exc
+
+    def close(self) -> Optional[BaseException]:
+        self._queue.put(_WRITER_STOP)
+        self._thread.join()
+        return self._error
+
+
+@dataclass(frozen=True, slots=True)
+class _PreparedDataset:
+    """Dataset rows for one template, shared by all of its agent runs."""
+
+    records: List[Dict[str, Any]]
+    jsonl: bytes
+    has_context: bool
+    content: List[Dict[str, Any]]  # file_content rows sent inline with every run
+
+
+@dataclass(slots=True)
 class AgentInfo:
     """Simplified agent metadata for evaluation."""
 
@@ -83,8 +233,16 @@ class AgentInfo:
 class EvaluationEngine:
     """Runs sample evaluations against agents via Foundry eval runs."""
 
-    def __init__(self, templates_dir=None) -> None:
+    def __init__(self, templates_dir=None, max_workers: int = 5, stream_outputs: bool = False) -> None:
         self.template_loader = EvaluationTemplateLoader(templates_dir=templates_dir)
+        self.max_workers = max(1, int(max_workers))
+        # Opt-in: stream run output items to a sidecar JSONL file instead of
+        # embedding them in the result JSON, so memory stays flat for large runs.
+        # This changes the result schema ("outputs" -> "outputs_path" + counts).
+        self.stream_outputs = stream_outputs
+        # Eval definition ids keyed by a hash of the definition content.
+        self._eval_id_cache: Dict[str, str] = {}
+        self._agents_cache: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
 
     def run(
         self,
@@ -93,13 +251,22 @@ class EvaluationEngine:
         model_deployment_name: Optional[str] = None,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
         log_callback: Optional[Callable[[str], None]] = None,
+        force_recreate: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Run selected evaluation templates against agents."""
+        """Run selected evaluation templates against agents.
+
+        Eval definitions already created by this engine for identical template
+        content are reused unless ``force_recreate`` is set.
+        """
         if not template_ids:
             raise ValueError("No evaluation templates selected")
         if not agent_names:
             raise ValueError("No agents selected for evaluation")
 
+        # Repeated ids would only re-run identical (template, agent) pairs.
+        template_ids = list(dict.fromkeys(template_ids))
+        agent_names = list(dict.fromkeys(agent_names))
+
         templates = [self.template_loader.load_template(tid) for tid in template_ids]
         agents = self._resolve_agents(agent_names, log_callback=log_callback)
 
@@ -121,47 +288,128 @@ class EvaluationEngine:
         if total_steps == 0:
             raise ValueError("Selected evaluations have no dataset items")
 
-        current_step = 0
-        results = []
+        # Both clients are process-wide singletons held by AzureClientFactory
+        # (reset when the endpoint changes), so repeated run() calls reuse the
+        # same connection pool; the OpenAI client is safe to share across the
+        # worker threads below.
         openai_client = get_openai_client()
         project_client = get_project_client()
         project_endpoint = getattr(getattr(project_client, "_config", None), "endpoint", "")
 
-        for template in templates:
-            eval_id = self._create_eval_definition(
+        # One timestamp per run() call; the step number keeps the dataset
+        # names of concurrent runs distinct.
+        base_timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+        # Eval definitions (one per template) are created concurrently before
+        # any run starts; the runs themselves are independent and mostly wait
+        # on Foundry, so they are executed concurrently too.
+        def create_definition(template: EvaluationTemplate) -> str:
+            return self._create_eval_definition(
                 template,
                 openai_client,
                 model_deployment_name=model_deployment_name,
                 log_callback=log_callback,
+                timestamp=base_timestamp,
+                force_recreate=force_recreate,
             )
-            for agent in agents:
-                current_step += 1
-                if progress_callback:
-                    progress_callback(
-                        current_step,
-                        total_steps,
-                        f"{template.id}: {agent.name} ({current_step}/{total_steps})",
-                    )
-                run_result = self._run_template_for_agent(
-                    template=template,
-                    agent=agent,
-                    openai_client=openai_client,
-                    eval_id=eval_id,
-                    project_endpoint=project_endpoint,
-                    log_callback=log_callback,
-                )
-                results.append(run_result)
+
+        with ThreadPoolExecutor(max_workers=min(len(templates), _MAX_DEFINITION_WORKERS)) as executor:
+            eval_ids = list(executor.map(create_definition, templates))
+
+        jobs: List[Tuple[EvaluationTemplate, str, AgentInfo, _PreparedDataset]] = []
+        for template, eval_id in zip(templates, eval_ids):
+            dataset = self._prepare_dataset(template)
+            jobs.extend((template, eval_id, agent, dataset) for agent in agents)
+
+        # next() on itertools.count is atomic under the GIL, so workers claim
+        # step numbers without a lock; progress callbacks run on their own thread.
+        steps = itertools.count(1)
+        progress = _ProgressDispatcher(progress_callback) if progress_callback else None
+
+        def run_job(
+            template: EvaluationTemplate,
+            eval_id: str,
+            agent: AgentInfo,
+            dataset: _PreparedDataset,
+        ) -> Dict[str, Any]:
+            step = next(steps)
+            timestamp = f"{base_timestamp}-{step:04d}"
+            if progress is not None:
+                progress.post(step, total_steps, f"{template.id}: {agent.name} ({step}/{total_steps})")
+            return self._run_template_for_agent(
+                template=template,
+                agent=agent,
+                openai_client=openai_client,
+                eval_id=eval_id,
+                project_endpoint=project_endpoint,
+                log_callback=log_callback,
+                writer=writer,
+                timestamp=timestamp,
+                dataset=dataset,
+            )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        writer = _FileWriter()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs)))
+        try:
+            futures = {executor.submit(run_job, *job): index for index, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        finally:
+            # On failure, drop queued runs instead of waiting for all of them.
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Every dataset and result file is on disk before run() returns.
+            write_error = writer.close()
+            if progress is not None:
+                progress.close()
+        if write_error is not None:
+            raise write_error
 
         return results
 
+    async def arun(
+        self,
+        template_ids: List[str],
+        agent_names: List[str],
+        model_deployment_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        force_recreate: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Awaitable `run()` that keeps the event loop free while runs are polled.
+
+        The SDK clients are synchronous, so the blocking pipeline is moved to a
+        worker thread; the callbacks are invoked from worker threads as well.
+        """
+        return await asyncio.to_thread(
+            self.run,
+            template_ids,
+            agent_names,
+            model_deployment_name=model_deployment_name,
+            progress_callback=progress_callback,
+            log_callback=log_callback,
+            force_recreate=force_recreate,
+        )
+
     def _resolve_agents(
         self,
         agent_names: List[str],
         log_callback: Optional[Callable[[str], None]] = None,
+        refresh: bool = False,
     ) -> List[AgentInfo]:
-        """Resolve agent details for evaluation."""
-        manager = AgentManager()
-        available = {agent.get("name", ""): agent for agent in manager.list_agents()}
+        """Resolve agent details for evaluation.
+
+        The project agent listing is cached on the engine for a short while;
+        pass ``refresh=True`` to force a new listing.
+        """
+        now = time.monotonic()
+        cached = self._agents_cache
+        if refresh or cached is None or now - cached[0] >= _AGENTS_CACHE_TTL_S:
+            manager = AgentManager()
+            available = {agent.get("name", ""): agent for agent in manager.list_agents()}
+            self._agents_cache = (now, available)
+        else:
+            available = cached[1]
         agents: List[AgentInfo] = []
 
         for name in agent_names:
@@ -187,16 +435,28 @@ class EvaluationEngine:
         openai_client,
         model_deployment_name: Optional[str],
         log_callback=None,
+        timestamp: Optional[str] = None,
+        force_recreate: bool = False,
     ) -> str:
-        """Create a new evaluation definition for a template."""
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        """Create (or reuse an identical) evaluation definition for a template."""
+        timestamp = timestamp or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         eval_name = f"{template.display_name} ({timestamp})"
-        data_source_config = self._build_data_source_config(template)
+        dataset_flags = self._dataset_flags(template)
+        data_source_config = self._build_data_source_config(template, dataset_flags=dataset_flags)
         testing_criteria = self._build_testing_criteria(
             template,
             model_deployment_name=model_deployment_name,
+            dataset_flags=dataset_flags,
         )
 
+        cache_key = _definition_key(template.id, data_source_config, testing_criteria)
+        if not force_recreate:
+            cached_id = self._eval_id_cache.get(cache_key)
+            if cached_id:
+                if log_callback:
+                    log_callback(f"[*] Reusing evaluation definition for {template.display_name}")
+                return cached_id
+
         if log_callback:
             log_callback(f"[*] Creating evaluation definition for {template.display_name}")
 
@@ -205,7 +465,10 @@ class EvaluationEngine:
             data_source_config=data_source_config,
             testing_criteria=testing_criteria,
         )
-        return getattr(eval_object, "id", None) or eval_object.get("id")
+        eval_id = _extract_id(eval_object)
+        if eval_id:
+            self._eval_id_cache[cache_key] = eval_id
+        return eval_id
 
     def _run_template_for_agent(
         self,
@@ -215,20 +478,38 @@ class EvaluationEngine:
         eval_id: str,
         project_endpoint: str,
         log_callback: Optional[Callable[[str], None]] = None,
+        writer: Optional[_FileWriter] = None,
+        timestamp: Optional[str] = None,
+        dataset: Optional[_PreparedDataset] = None,
     ) -> Dict[str, Any]:
-        """Run a single template for a single agent."""
+        """Run a single template for a single agent.
+
+        With a ``writer``, the dataset and result files are written on its
+        background thread; otherwise they are written inline. ``dataset`` is the
+        template's prepared rows, built here when not supplied.
+        """
         config.ensure_directories()
         dataset_dir = config.EVALUATIONS_RESULTS_DIR / "datasets"
         dataset_dir.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        timestamp = timestamp or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         dataset_name = self._build_dataset_name(template.id, agent.name, timestamp)
 
-        dataset_records = [self._build_dataset_record(item) for item in template.dataset_items]
+        if dataset is None:
+            dataset = self._prepare_dataset(template)
         dataset_path = dataset_dir / f"{dataset_name}.jsonl"
-        self._write_jsonl(dataset_path, dataset_records)
+        if writer is not None:
+            writer.submit_bytes(dataset_path, dataset.jsonl)
+        else:
+            _write_bytes_atomic(dataset_path, dataset.jsonl)
 
-        data_source = self._build_data_source(template, agent, dataset_records)
+        data_source = self._build_data_source(
+            template,
+            agent,
+            dataset.records,
+            has_context=dataset.has_context,
+            content=dataset.content,
+        )
         run_name = f"{template.display_name} - {agent.name}"
 
         if log_callback:
@@ -239,7 +520,7 @@ class EvaluationEngine:
             name=run_name,
             data_source=data_source,
         )
-        run_id = getattr(run_response, "id", None) or run_response.get("id")
+        run_id = _extract_id(run_response)
 
         run_result = self._wait_for_run(
             openai_client,
@@ -248,9 +529,21 @@ class EvaluationEngine:
             log_callback=log_callback,
         )
 
-        output_items = self._list_output_items(openai_client, eval_id=eval_id, run_id=run_id)
-
         result_path = config.EVALUATIONS_RESULTS_DIR / f"{template.id}_{dataset_name}.json"
+        output_items = self._iter_output_items(openai_client, eval_id=eval_id, run_id=run_id)
+        if self.stream_outputs:
+            status_counts: Dict[str, int] = {}
+            outputs_path = config.EVALUATIONS_RESULTS_DIR / f"{template.id}_{dataset_name}.outputs.jsonl"
+            _write_jsonl_stream_atomic(outputs_path, _count_statuses(output_items, status_counts))
+            # Only these running totals are kept in memory when outputs are streamed.
+            outputs = {
+                "outputs_path": str(outputs_path),
+                "output_count": sum(status_counts.values()),
+                "output_status_counts": status_counts,
+            }
+        else:
+            outputs = {"outputs": list(output_items)}
+
         record = {
             "evaluation_id": template.id,
             "evaluation_name": run_name,
@@ -264,11 +557,13 @@ class EvaluationEngine:
             "dataset_name": dataset_name,
             "dataset_path": str(dataset_path),
             "project_endpoint": project_endpoint,
-            "outputs": output_items,
+            **outputs,
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
-        with open(result_path, "w", encoding="utf-8") as handle:
-            json.dump(record, handle, indent=2, ensure_ascii=True)
+        if writer is not None:
+            writer.submit(result_path, _dumps_indented, record)
+        else:
+            _write_bytes_atomic(result_path, _dumps_indented(record))
 
         return {
             "evaluation_id": template.id,
@@ -281,6 +576,25 @@ class EvaluationEngine:
             "result_path": str(result_path),
         }
 
+    def _prepare_dataset(self, template: EvaluationTemplate) -> _PreparedDataset:
+        """Build and serialize a template's dataset rows once for all agents."""
+        # One traversal yields the rows, their inline content wrappers and JSONL bytes
+        records: List[Dict[str, Any]] = []
+        content: List[Dict[str, Any]] = []
+        lines: List[bytes] = []
+        for item in template.dataset_items:
+            record = self._build_dataset_record(item)
+            records.append(record)
+            content.append({"item": record})
+            lines.append(_dumps_line(record))
+        has_context, _ = self._dataset_flags(template)
+        return _PreparedDataset(
+            records=records,
+            jsonl=b"".join(lines),
+            has_context=has_context,
+            content=content,
+        )
+
     def _build_dataset_record(self, item: EvaluationItem) -> Dict[str, Any]:
         """Build a dataset row from template data."""
         record = {"query": item.query}
@@ -292,25 +606,45 @@ class EvaluationEngine:
 
     def _write_jsonl(self, path: Path, records: List[Dict[str, Any]]) -> None:
         """Write a JSONL dataset file."""
-        with open(path, "w", encoding="utf-8") as handle:
-            for record in records:
-                handle.write(json.dumps(record, ensure_ascii=True) + "\n")
+        _write_bytes_atomic(path, _dumps_jsonl(records))
 
     def _build_dataset_name(self, template_id: str, agent_name: str, timestamp: str) -> str:
         """Create a dataset name safe for the service."""
-        safe_agent = re.sub(r"[^a-zA-Z0-9-]+", "-", agent_name).strip("-").lower()
-        safe_template = re.sub(r"[^a-zA-Z0-9-]+", "-", template_id).strip("-").lower()
-        name = f"eval-{safe_template}-{safe_agent}-{timestamp}".lower()
-        return name[:80]
+        safe_agent = _SLUG_RE.sub("-", agent_name).strip("-")
+        safe_template = _SLUG_RE.sub("-", template_id).strip("-")
+        # Truncate the descriptive prefix, never the timestamp that makes the name unique.
+        prefix = f"eval-{safe_template}-{safe_agent}"[: 79 - len(timestamp)]
+        return f"{prefix}-{timestamp}".lower()[:80]
+
+    def _dataset_flags(self, template: EvaluationTemplate) -> Tuple[bool, bool]:
+        """Return the template's load-time dataset flags, scanning items if absent."""
+        return getattr(template, "dataset_flags", None) or self._scan_dataset(template.dataset_items)
+
+    def _scan_dataset(self, items: List[EvaluationItem]) -> Tuple[bool, bool]:
+        """Return (has_context, has_ground_truth) for dataset items in one pass."""
+        has_context = has_ground_truth = False
+        for item in items:
+            if item.context:
+                has_context = True
+            if item.ground_truth:
+                has_ground_truth = True
+            if has_context and has_ground_truth:
+                break
+        return has_context, has_ground_truth
 
-    def _build_data_source_config(self, template: EvaluationTemplate) -> DataSourceConfigCustom:
+    def _build_data_source_config(
+        self,
+        template: EvaluationTemplate,
+        dataset_flags: Optional[Tuple[bool, bool]] = None,
+    ) -> DataSourceConfigCustom:
         """Build the eval data source schema."""
         properties = {"query": {"type": "string"}}
         required = ["query"]
 
-        if any(item.context for item in template.dataset_items):
+        has_context, has_ground_truth = dataset_flags or self._dataset_flags(template)
+        if has_context:
             properties["context"] = {"type": "string"}
-        if any(item.ground_truth for item in template.dataset_items):
+        if has_ground_truth:
             properties["ground_truth"] = {"type": "string"}
 
         return DataSourceConfigCustom(
@@ -327,46 +661,63 @@ class EvaluationEngine:
         self,
         template: EvaluationTemplate,
         model_deployment_name: Optional[str],
+        dataset_flags: Optional[Tuple[bool, bool]] = None,
     ) -> List[Dict[str, Any]]:
         """Build testing criteria for eval creation."""
-        criteria = []
-        has_context = any(item.context for item in template.dataset_items)
-
-        for evaluator in template.evaluators:
-            evaluator_type = evaluator.type.lower()
-            if evaluator_type in EVALUATOR_NAME_MAP:
-                data_mapping = self._resolve_data_mapping(evaluator, evaluator_type, has_context)
-                entry: Dict[str, Any] = {
-                    "type": "azure_ai_evaluator",
-                    "name": evaluator.name,
-                    "evaluator_name": EVALUATOR_NAME_MAP[evaluator_type],
-                    "data_mapping": data_mapping,
-                }
-                init_params = self._build_initialization_parameters(
-                    evaluator,
-                    evaluator_type,
-                    model_deployment_name=model_deployment_name,
-                )
-                if init_params:
-                    entry["initialization_parameters"] = init_params
-                criteria.append(entry)
-            elif evaluator_type == "string_check":
-                criteria.append(self._build_string_check_grader(evaluator))
-            else:
-                raise ValueError(f"Unsupported evaluator type '{evaluator.type}' in template {template.id}")
+        has_context = (dataset_flags or self._dataset_flags(template))[0]
+        return [
+            self._build_criterion(
+                evaluator,
+                self._evaluator_spec(evaluator, template),
+                model_deployment_name=model_deployment_name,
+                has_context=has_context,
+            )
+            for evaluator in template.evaluators
+        ]
 
-        return criteria
+    def _evaluator_spec(self, evaluator: EvaluatorDefinition, template: EvaluationTemplate) -> EvaluatorSpec:
+        """Return the evaluator's spec (attached at template load, else looked up)."""
+        spec = evaluator.spec or EVALUATOR_SPECS.get(evaluator.type.lower())
+        if spec is None:
+            raise ValueError(f"Unsupported evaluator type '{evaluator.type}' in template {template.id}")
+        return spec
+
+    def _build_criterion(
+        self,
+        evaluator: EvaluatorDefinition,
+        spec: EvaluatorSpec,
+        model_deployment_name: Optional[str],
+        has_context: bool,
+    ) -> Dict[str, Any]:
+        """Build the testing criterion for a single evaluator."""
+        if spec.builtin_name is None:
+            return self._build_string_check_grader(evaluator)
+
+        entry: Dict[str, Any] = {
+            "type": "azure_ai_evaluator",
+            "name": evaluator.name,
+            "evaluator_name": spec.builtin_name,
+            "data_mapping": self._resolve_data_mapping(evaluator, spec, has_context),
+        }
+        init_params = self._build_initialization_parameters(
+            evaluator,
+            spec,
+            model_deployment_name=model_deployment_name,
+        )
+        if init_params:
+            entry["initialization_parameters"] = init_params
+        return entry
 
     def _build_initialization_parameters(
         self,
         evaluator: EvaluatorDefinition,
-        evaluator_type: str,
+        spec: EvaluatorSpec,
         model_deployment_name: Optional[str],
     ) -> Dict[str, Any]:
         """Build evaluator initialization parameters for the current SDK."""
         init_params = dict(evaluator.init_params or {})
 
-        if evaluator_type in MODEL_DEPLOYMENT_EVALUATORS:
+        if spec.needs_model:
             if not model_deployment_name:
                 raise ValueError("Select a model deployment for model-based evaluations.")
             init_params.setdefault("deployment_name", model_deployment_name)
@@ -376,14 +727,14 @@ class EvaluationEngine:
     def _resolve_data_mapping(
         self,
         evaluator: EvaluatorDefinition,
-        evaluator_type: str,
+        spec: EvaluatorSpec,
         has_context: bool,
     ) -> Dict[str, str]:
         """Resolve evaluator data mappings using template defaults."""
         if evaluator.data_mapping:
             return self._normalize_mapping(evaluator.data_mapping)
 
-        if evaluator_type in GROUND_TRUTH_EVALUATORS:
+        if spec.needs_ground_truth:
             return {
                 "response": "{{sample.output_text}}",
                 "ground_truth": "{{item.ground_truth}}",
@@ -407,7 +758,7 @@ class EvaluationEngine:
             if "{{" in text and "}}" in text:
                 normalized[key] = text
                 continue
-            match = re.match(r"^\$\{data\.([a-zA-Z0-9_.]+)\}$", text)
+            match = _DATA_TEMPLATE_RE.match(text)
             if match:
                 field = match.group(1)
             elif text.startswith("data."):
@@ -447,25 +798,45 @@ class EvaluationEngine:
 
     def _templates_require_model(self, templates: List[EvaluationTemplate]) -> bool:
         """Check if any template requires a model deployment."""
-        for template in templates:
-            for evaluator in template.evaluators:
-                if evaluator.type.lower() in MODEL_DEPLOYMENT_EVALUATORS:
-                    return True
-        return False
+        return any(self._template_requires_model(template) for template in templates)
+
+    def _template_requires_model(self, template: EvaluationTemplate) -> bool:
+        """Check (and remember on the template) whether it needs a model deployment."""
+        requires_model = getattr(template, "requires_model", None)
+        if requires_model is None:
+            requires_model = any(self._evaluator_needs_model(evaluator) for evaluator in template.evaluators)
+            template.requires_model = requires_model
+        return requires_model
+
+    @staticmethod
+    def _evaluator_needs_model(evaluator: EvaluatorDefinition) -> bool:
+        """Read needs_model off the load-time spec; fall back to a name lookup."""
+        spec = getattr(evaluator, "spec", None)
+        if spec is not None:
+            return spec.needs_model
+        return evaluator.type.lower() in MODEL_DEPLOYMENT_EVALUATORS
 
     def _build_data_source(
         self,
         template: EvaluationTemplate,
         agent: AgentInfo,
         dataset_records: List[Dict[str, Any]],
+        has_context: Optional[bool] = None,
+        content: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
-        """Build eval run data source configuration."""
-        has_context = any("context" in record for record in dataset_records)
+        """Build eval run data source configuration.
+
+        All dataset rows go inline in a single request; pass the template's
+        prebuilt ``content`` to share it across agents.
+        """
+        if has_context is None:
+            has_context = any("context" in record for record in dataset_records)
         prompt_text = "{{item.query}}"
         if has_context:
             prompt_text = "Context: {{item.context}}\n\n{{item.query}}"
 
-        content = [{"item": record} for record in dataset_records]
+        if content is None:
+            content = [{"item": record} for record in dataset_records]
         data_source = {
             "type": "azure_ai_target_completions",
             "source": {
@@ -502,15 +873,19 @@ class EvaluationEngine:
         timeout_seconds: int = 1800,
         log_callback: Optional[Callable[[str], None]] = None,
     ):
-        """Poll the evaluation run until completion."""
-        start_time = time.time()
+        """Poll the evaluation run until completion, backing off between polls."""
+        start_time = time.monotonic()
+        delay = 1.0
+        last_status = None
         run = openai_client.evals.runs.retrieve(eval_id=eval_id, run_id=run_id)
         while getattr(run, "status", None) in {"queued", "in_progress"}:
-            if time.time() - start_time > timeout_seconds:
+            if time.monotonic() - start_time > timeout_seconds:
                 raise TimeoutError("Evaluation run timed out.")
-            if log_callback:
+            if log_callback and run.status != last_status:
                 log_callback(f"[*] Run {run_id} status: {run.status}")
-            time.sleep(3)
+            last_status = run.status
+            time.sleep(delay + random.uniform(0, 0.5))
+            delay = min(delay * 2, _MAX_POLL_INTERVAL_S)
             run = openai_client.evals.runs.retrieve(eval_id=eval_id, run_id=run_id)
 
         if getattr(run, "status", None) in {"failed", "canceled"}:
@@ -519,24 +894,37 @@ class EvaluationEngine:
 
     def _list_output_items(self, openai_client, eval_id: str, run_id: str) -> List[Dict[str, Any]]:
         """Collect output items from a completed eval run."""
-        items = []
-        after = None
+        return list(self._iter_output_items(openai_client, eval_id=eval_id, run_id=run_id))
+
+    def _iter_output_items(self, openai_client, eval_id: str, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield output items from a completed eval run, one page at a time."""
+        as_dict = self._as_dict
+        page = openai_client.evals.runs.output_items.list(
+            eval_id=eval_id,
+            run_id=run_id,
+            limit=100,
+        )
+        if hasattr(page, "iter_pages"):
+            # SDK cursor pages fetch the following pages while being iterated.
+            for item in page:
+                yield as_dict(item)
+            return
+
         while True:
-            page = openai_client.evals.runs.output_items.list(
-                eval_id=eval_id,
-                run_id=run_id,
-                limit=100,
-                after=after,
-            )
             page_items = getattr(page, "data", [])
             for item in page_items:
-                items.append(self._as_dict(item))
+                yield as_dict(item)
             if not getattr(page, "has_more", False) or not page_items:
                 break
             after = getattr(page_items[-1], "id", None)
             if not after:
                 break
-        return items
+            page = openai_client.evals.runs.output_items.list(
+                eval_id=eval_id,
+                run_id=run_id,
+                limit=100,
+                after=after,
+            )
 
     def list_recent_runs(
         self,
@@ -550,19 +938,26 @@ class EvaluationEngine:
         if eval_items is None:
             eval_items = list(evals_page)
 
-        runs: List[Dict[str, Any]] = []
+        evals: List[Tuple[str, str]] = []
         for eval_item in eval_items:
             eval_dict = self._as_dict(eval_item)
             eval_id = eval_dict.get("id")
-            if not eval_id:
-                continue
-            eval_name = eval_dict.get("name") or eval_id
+            if eval_id:
+                evals.append((eval_id, eval_dict.get("name") or eval_id))
 
+        def list_runs(eval_id: str) -> List[Any]:
             run_page = openai_client.evals.runs.list(eval_id=eval_id, order="desc", limit=runs_per_eval)
             run_items = getattr(run_page, "data", None)
-            if run_items is None:
-                run_items = list(run_page)
+            return list(run_page) if run_items is None else run_items
+
+        # One runs.list round-trip per eval; issue them concurrently.
+        runs: List[Dict[str, Any]] = []
+        if not evals:
+            return runs
+        with ThreadPoolExecutor(max_workers=min(len(evals), self.max_workers)) as executor:
+            run_lists = list(executor.map(list_runs, [eval_id for eval_id, _ in evals]))
 
+        for (eval_id, eval_name), run_items in zip(evals, run_lists):
             for run in run_items:
                 run_dict = self._as_dict(run)
                 run_name = run_dict.get("name") or ""
@@ -614,10 +1009,14 @@ class EvaluationEngine:
         """Convert SDK objects to plain dicts."""
         if isinstance(value, dict):
             return value
-        if hasattr(value, "model_dump"):
-            return value.model_dump()
-        if hasattr(value, "dict"):
-            return value.dict()
-        if hasattr(value, "__dict__"):
-            return dict(value.__dict__)
-        return {"value": value}
+        model_dump = getattr(value, "model_dump", None)
+        if model_dump is not None:
+            return model_dump()
+        as_dict = getattr(value, "dict", None)
+        if as_dict is not None:
+            return as_dict()
+        try:
+            # Copy, so callers adding keys never mutate the SDK object itself
+            return dict(vars(value))
+        except TypeError:
+            return {"value": value}
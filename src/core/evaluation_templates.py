@@ -4,14 +4,79 @@ Sample evaluation template loader.
 Loads YAML-based evaluation templates used to run local sample evaluations.
 """
 
+import copy
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
-
-@dataclass
+# The libyaml-backed loader is several times faster when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+EVALUATOR_NAME_MAP = {
+    "bleu_score": "builtin.bleu_score",
+    "coherence": "builtin.coherence",
+    "f1_score": "builtin.f1_score",
+    "fluency": "builtin.fluency",
+    "gleu_score": "builtin.gleu_score",
+    "hate_unfairness": "builtin.hate_unfairness",
+    "meteor_score": "builtin.meteor_score",
+    "prohibited_actions": "builtin.prohibited_actions",
+    "relevance": "builtin.relevance",
+    "response_completeness": "builtin.response_completeness",
+    "rouge_score": "builtin.rouge_score",
+    "self_harm": "builtin.self_harm",
+    "sensitive_data_leakage": "builtin.sensitive_data_leakage",
+    "sexual": "builtin.sexual",
+    "similarity": "builtin.similarity",
+    "violence": "builtin.violence",
+}
+
+MODEL_DEPLOYMENT_EVALUATORS = {
+    "coherence",
+    "fluency",
+    "relevance",
+    "response_completeness",
+    "similarity",
+}
+
+GROUND_TRUTH_EVALUATORS = {
+    "bleu_score",
+    "f1_score",
+    "gleu_score",
+    "meteor_score",
+    "response_completeness",
+    "rouge_score",
+    "similarity",
+}
+
+STRING_CHECK_EVALUATOR = "string_check"
+
+
+@dataclass(frozen=True)
+class EvaluatorSpec:
+    """How an evaluator type maps onto an eval testing criterion."""
+
+    type_key: str
+    builtin_name: Optional[str] = None  # None for string-check graders
+    needs_model: bool = False
+    needs_ground_truth: bool = False
+
+
+EVALUATOR_SPECS: Dict[str, EvaluatorSpec] = {
+    type_key: EvaluatorSpec(
+        type_key=type_key,
+        builtin_name=builtin_name,
+        needs_model=type_key in MODEL_DEPLOYMENT_EVALUATORS,
+        needs_ground_truth=type_key in GROUND_TRUTH_EVALUATORS,
+    )
+    for type_key, builtin_name in EVALUATOR_NAME_MAP.items()
+}
+EVALUATOR_SPECS[STRING_CHECK_EVALUATOR] = EvaluatorSpec(type_key=STRING_CHECK_EVALUATOR)
+
+
+@dataclass(slots=True)
 class EvaluationItem:
     """Single evaluation dataset row."""
 
@@ -20,7 +85,7 @@ class EvaluationItem:
     ground_truth: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluatorDefinition:
     """Evaluator definition for a template."""
 
@@ -31,9 +96,10 @@ class EvaluatorDefinition:
     init_params: Dict[str, Any] = field(default_factory=dict)
     data_mapping: Dict[str, Any] = field(default_factory=dict)
     params: Dict[str, Any] = field(default_factory=dict)
+    spec: Optional[EvaluatorSpec] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationTemplate:
     """Evaluation template metadata and dataset."""
 
@@ -42,6 +108,10 @@ class EvaluationTemplate:
     description: str
     dataset_items: List[EvaluationItem] = field(default_factory=list)
     evaluators: List[EvaluatorDefinition] = field(default_factory=list)
+    # (has_context, has_ground_truth) across dataset_items, computed at load time
+    dataset_flags: Optional[Tuple[bool, bool]] = field(default=None, repr=False, compare=False)
+    # Memoized by the engine; None until first checked
+    requires_model: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
 
 
 class EvaluationTemplateLoader:
@@ -50,6 +120,12 @@ class EvaluationTemplateLoader:
     def __init__(self, templates_dir: Path = None) -> None:
         repo_root = Path(__file__).resolve().parents[2]
         self.templates_dir = templates_dir or repo_root / "evaluation-templates"
+        # Parsed templates keyed by path, valid while the file's
+        # (mtime_ns, size, inode) signature is unchanged
+        self._cache: Dict[Path, Tuple[Tuple[int, int, int], EvaluationTemplate]] = {}
+        # stem -> path index, valid while the directory's mtime is unchanged
+        self._paths_by_stem: Dict[str, Path] = {}
+        self._dir_mtime_ns: Optional[int] = None
 
     def list_template_files(self) -> List[Path]:
         """List available template files."""
@@ -59,20 +135,46 @@ class EvaluationTemplateLoader:
         """Load all templates."""
         templates = []
         for path in self.list_template_files():
-            templates.append(self._load_from_path(path))
+            templates.append(self._load_cached(path))
         return templates
 
     def load_template(self, template_id: str) -> EvaluationTemplate:
         """Load a template by ID."""
-        for path in self.list_template_files():
-            if path.stem == template_id:
-                return self._load_from_path(path)
-        raise FileNotFoundError(f"Evaluation template '{template_id}' not found")
+        path = self._template_paths().get(template_id)
+        if path is None:
+            raise FileNotFoundError(f"Evaluation template '{template_id}' not found")
+        return self._load_cached(path)
+
+    def _template_paths(self) -> Dict[str, Path]:
+        """Return the stem -> path index, rescanning only when the directory changed."""
+        try:
+            dir_mtime_ns = self.templates_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if dir_mtime_ns != self._dir_mtime_ns:
+            self._paths_by_stem = {path.stem: path for path in self.list_template_files()}
+            self._dir_mtime_ns = dir_mtime_ns
+        return self._paths_by_stem
+
+    def _load_cached(self, path: Path) -> EvaluationTemplate:
+        """
+        Load a template, reusing the parsed result while the file is unchanged.
+
+        Callers get their own copy, so mutating a returned template never leaks
+        into the cache or into other callers' templates.
+        """
+        st = path.stat()
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._cache.get(path)
+        if cached is None or cached[0] != sig:
+            cached = (sig, self._load_from_path(path))
+            self._cache[path] = cached
+        return copy.deepcopy(cached[1])
 
     def _load_from_path(self, path: Path) -> EvaluationTemplate:
         """Load a template from a YAML file."""
         with open(path, "r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+            data = yaml.load(handle, Loader=_YAML_LOADER) or {}
 
         template_id = data.get("id", "").strip()
         if not template_id:
@@ -82,22 +184,25 @@ class EvaluationTemplateLoader:
         description = data.get("description", "").strip()
 
         dataset_items = []
+        has_context = has_ground_truth = False
         dataset_data = data.get("dataset", {}) or {}
         for item in dataset_data.get("items", []) or []:
-            dataset_items.append(
-                EvaluationItem(
-                    query=str(item.get("query", "")).strip(),
-                    context=str(item.get("context", "") or "").strip(),
-                    ground_truth=str(item.get("ground_truth", "") or "").strip(),
-                )
+            dataset_item = EvaluationItem(
+                query=str(item.get("query", "")).strip(),
+                context=str(item.get("context", "") or "").strip(),
+                ground_truth=str(item.get("ground_truth", "") or "").strip(),
             )
+            has_context = has_context or bool(dataset_item.context)
+            has_ground_truth = has_ground_truth or bool(dataset_item.ground_truth)
+            dataset_items.append(dataset_item)
 
         evaluators = []
         for evaluator in data.get("evaluators", []) or []:
+            evaluator_type = str(evaluator.get("type", "")).strip().lower()
             evaluators.append(
                 EvaluatorDefinition(
                     name=str(evaluator.get("name", "")).strip(),
-                    type=str(evaluator.get("type", "")).strip(),
+                    type=evaluator_type,
                     evaluator_id=str(evaluator.get("evaluator_id", "")).strip(),
                     min_score=float(evaluator.get("min_score", 0.0) or 0.0),
                     init_params=dict(
@@ -107,6 +212,9 @@ class EvaluationTemplateLoader:
                     ),
                     data_mapping=dict(evaluator.get("data_mapping", {}) or {}),
                     params=dict(evaluator.get("params", {}) or {}),
+                    # Unknown types keep spec=None so listing still works; the
+                    # engine rejects them only when this template is run.
+                    spec=EVALUATOR_SPECS.get(evaluator_type),
                 )
             )
 
@@ -116,4 +224,5 @@ class EvaluationTemplateLoader:
             description=description,
             dataset_items=dataset_items,
             evaluators=evaluators,
+            dataset_flags=(has_context, has_ground_truth),
         )
@@ -6,9 +6,10 @@ Provides workflow template building and batch workflow creation.
 
 from __future__ import annotations
 
+import functools
 import random
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from azure.ai.projects.models import PromptAgentDefinition, WorkflowAgentDefinition
 
@@ -17,6 +18,24 @@ from ..models.industry_profile import IndustryProfile, AgentType
 from ..models.workflow import WorkflowTemplate, WorkflowRole, CreatedWorkflow, WorkflowBatchResult
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=256)
+def _slugify_text(value: str) -> str:
+    """Lowercase snake_case slug; role ids repeat across workflow builds, so results are cached."""
+    slug = _SLUG_RE.sub("_", value.lower()).strip("_")
+    return slug or "role"
+
+
+@functools.lru_cache(maxsize=64)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Single alternation regex matching any of the keywords as a substring."""
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
 class WorkflowManager:
     """Manager for creating workflow agents and related prompt agents."""
 
@@ -95,24 +114,31 @@ class WorkflowManager:
             return []
 
         agent_types = profile.agent_types
+        # Searchable text per agent type, built once for all pick_agent calls.
+        haystacks = [
+            (
+                agent_type,
+                " ".join(
+                    [
+                        agent_type.id,
+                        agent_type.name,
+                        agent_type.description or "",
+                    ]
+                ).lower(),
+            )
+            for agent_type in agent_types
+        ]
 
         def pick_agent(
             keywords: List[str],
             exclude_ids: Optional[set[str]] = None,
         ) -> Optional[AgentType]:
             exclude_ids = exclude_ids or set()
-            for agent_type in agent_types:
-                if agent_type.id in exclude_ids:
-                    continue
-                haystack = " ".join(
-                    [
-                        agent_type.id,
-                        agent_type.name,
-                        agent_type.description or "",
-                    ]
-                ).lower()
-                if any(keyword in haystack for keyword in keywords):
-                    return agent_type
+            pattern = _keyword_pattern(tuple(keywords))
+            if pattern is not None:
+                for agent_type, haystack in haystacks:
+                    if agent_type.id not in exclude_ids and pattern.search(haystack):
+                        return agent_type
             for agent_type in agent_types:
                 if agent_type.id not in exclude_ids:
                     return agent_type
@@ -812,8 +838,7 @@ class WorkflowManager:
         return "\n".join(lines)
 
     def _slugify(self, value: str) -> str:
-        slug = re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_")
-        return slug or "role"
+        return _slugify_text(value)
 
     def _conversation_var(self, role_key: str) -> str:
         return f"Local.{role_key.title().replace('_', '')}ConversationId"
@@ -5,8 +5,9 @@ These models define the structure for agent creation, configuration,
 and management within the toolkit.
 """
 
+import sys
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Mapping, Sequence
 from pydantic import BaseModel, Field
 
 
@@ -94,15 +95,34 @@ class CreatedAgent(BaseModel):
         agent_type = None
         name_parts = row.get("name", "").split("-")
         if len(name_parts) >= 2:
-            agent_type = name_parts[1]
+            agent_type = sys.intern(name_parts[1])
 
         return cls(
             agent_id=row["agent_id"],
             name=row["name"],
             azure_id=row["azure_id"],
             version=int(row["version"]),
-            model=row["model"],
-            org_id=row["org_id"],
+            model=sys.intern(row["model"]),
+            org_id=sys.intern(row["org_id"]),
+            agent_type=agent_type,
+        )
+
+    @classmethod
+    def from_csv_row_tuple(cls, row: Sequence[str], idx: Mapping[str, int]) -> "CreatedAgent":
+        """Create from a positional CSV row using header column indices."""
+        name = row[idx["name"]]
+        name_parts = name.split("-")
+        agent_type = sys.intern(name_parts[1]) if len(name_parts) >= 2 else None
+
+        # Model, org and type repeat across agents (and every metric they emit),
+        # so intern them to share one string object per distinct value.
+        return cls(
+            agent_id=row[idx["agent_id"]],
+            name=name,
+            azure_id=row[idx["azure_id"]],
+            version=int(row[idx["version"]]),
+            model=sys.intern(row[idx["model"]]),
+            org_id=sys.intern(row[idx["org_id"]]),
             agent_type=agent_type,
         )
 
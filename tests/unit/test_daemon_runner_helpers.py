@@ -0,0 +1,174 @@
+import json
+import types
+from datetime import datetime
+
+from src.core.daemon_runner import DaemonConfig, DaemonRunner, _HistoryWriter, iso_now_fast
+from src.models.agent import CreatedAgent
+
+
+def _dummy_agent() -> CreatedAgent:
+    return CreatedAgent(
+        agent_id="AG001",
+        name="ORG-TestAgent-AG001",
+        azure_id="ORG-TestAgent-AG001:1",
+        version=1,
+        model="gpt-test",
+        org_id="ORG",
+        agent_type="TestAgent",
+    )
+
+
+def test_generate_query_fills_placeholders_from_current_templates() -> None:
+    runner = DaemonRunner(agents=[_dummy_agent()])
+    runner.query_templates = {"TestAgent": ["Order {} for {}"], "Static": ["Hello"]}
+
+    query = runner._generate_query("TestAgent")
+    parts = query.split()
+    assert parts[0] == "Order" and parts[2] == "for"
+    assert parts[1].isdigit() and parts[3].isdigit()
+    assert runner._generate_query("Static") == "Hello"
+    assert runner._generate_query("Missing") == DaemonRunner.DEFAULT_QUERY
+
+    runner.query_templates["Static"] = ["Bye"]
+    assert runner._generate_query("Static") == "Bye"
+
+
+def test_metrics_snapshot_matches_live_metrics() -> None:
+    runner = DaemonRunner(agents=[_dummy_agent()])
+    runner._process_operation_result(
+        _dummy_agent(),
+        {"latency_ms": 120.0, "success": False, "error_message": "boom"},
+    )
+
+    snapshot = runner._metrics.snapshot()
+    metrics = runner.get_metrics()
+
+    assert metrics == snapshot.to_dict() == runner._metrics.to_dict()
+    assert metrics["failed_calls"] == 1
+    assert metrics["recent_errors"] == ["boom"]
+
+
+class _FakeConversations:
+    def __init__(self) -> None:
+        self.created = 0
+
+    def create(self):
+        self.created += 1
+        return types.SimpleNamespace(id=f"conv-{self.created}")
+
+
+class _FakeResponses:
+    def __init__(self) -> None:
+        self.conversation_ids = []
+
+    def create(self, conversation, extra_body, input):
+        self.conversation_ids.append(conversation)
+        return types.SimpleNamespace(output_text="ok")
+
+
+def _fake_client():
+    return types.SimpleNamespace(conversations=_FakeConversations(), responses=_FakeResponses())
+
+
+def test_call_agent_creates_conversation_per_call_by_default() -> None:
+    runner = DaemonRunner(agents=[_dummy_agent()])
+    client = _fake_client()
+
+    for _ in range(2):
+        runner._call_agent(_dummy_agent(), "hi", client)
+
+    assert client.conversations.created == 2
+
+
+def test_call_agent_reuses_and_rotates_conversation_when_enabled() -> None:
+    runner = DaemonRunner(agents=[_dummy_agent()])
+    runner._active_config = DaemonConfig(reuse_conversation=True, conversation_max_turns=2)
+    client = _fake_client()
+
+    for _ in range(5):
+        assert runner._call_agent(_dummy_agent(), "hi", client)["success"]
+
+    assert client.conversations.created == 3
+    assert client.responses.conversation_ids == ["conv-1", "conv-1", "conv-2", "conv-2", "conv-3"]
+
+
+def test_load_agents_reads_csv_positionally(tmp_path) -> None:
+    csv_path = tmp_path / "agents.csv"
+    csv_path.write_text(
+        "agent_id,name,azure_id,version,model,org_id\n"
+        "AG001,ORG-Support-AG001,ORG-Support-AG001:2,2,gpt-test,ORG\n",
+        encoding="utf-8",
+    )
+
+    runner = DaemonRunner(agents_csv=str(csv_path))
+
+    assert len(runner.agents) == 1
+    agent = runner.agents[0]
+    assert agent.name == "ORG-Support-AG001"
+    assert agent.version == 2
+    assert agent.agent_type == "Support"
+
+
+def test_log_drainer_delivers_queued_messages_on_stop() -> None:
+    runner = DaemonRunner(agents=[_dummy_agent()])
+    received = []
+    runner._log_callback = received.append
+
+    runner._start_log_drainer()
+    for idx in range(50):
+        runner._log(f"message {idx}")
+    runner._stop_log_drainer()
+
+    assert received == [f"message {idx}" for idx in range(50)]
+    assert not runner._log_thread.is_alive()
+
+
+def test_history_writer_appends_each_record_immediately(tmp_path) -> None:
+    path = tmp_path / "history.jsonl"
+    writer = _HistoryWriter(str(path))
+
+    writer.append({"total_calls": 1})
+    assert [json.loads(line)["total_calls"] for line in path.read_text(encoding="utf-8").splitlines()] == [1]
+
+    writer.append({"total_calls": 2})
+    writer.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["total_calls"] for line in lines] == [1, 2]
+
+
+def test_iso_now_fast_matches_datetime_isoformat() -> None:
+    before = datetime.now()
+    stamp = iso_now_fast()
+    after = datetime.now()
+
+    parsed = datetime.fromisoformat(stamp)
+    assert len(stamp) == len("2026-01-01T00:00:00.000000")
+    assert before.replace(microsecond=0) <= parsed <= after
+
+
+def test_iso_now_fast_reuses_second_prefix(monkeypatch) -> None:
+    import src.core.response_utils as response_utils
+
+    ticks = iter([5_000_000_001_000, 5_000_999_999_000, 5_001_000_002_000])
+    monkeypatch.setattr(response_utils.time, "time_ns", lambda: next(ticks))
+    monkeypatch.setattr(response_utils, "_iso_second_cache", (-1, ""))
+
+    first, second, third = iso_now_fast(), iso_now_fast(), iso_now_fast()
+
+    assert first[:-7] == second[:-7] != third[:-7]
+    assert (first[-6:], second[-6:], third[-6:]) == ("000001", "999999", "000002")
+
+
+def test_update_metrics_builds_snapshot_only_for_a_callback(monkeypatch) -> None:
+    runner = DaemonRunner(agents=[_dummy_agent()])
+    snapshots = []
+    monkeypatch.setattr(runner, "get_metrics", lambda: snapshots.append(1) or {"total_calls": 0})
+
+    runner._update_metrics()
+    assert snapshots == []
+
+    received = []
+    runner._metrics_callback = received.append
+    runner._update_metrics()
+    assert received == [{"total_calls": 0}]
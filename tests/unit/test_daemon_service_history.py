@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from src.core import config
+from src.core import daemon_service
+from src.core.daemon_service import DaemonService, _write_json_atomic
+
+
+@pytest.mark.unit
+def test_read_history_returns_last_samples(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    lines = [json.dumps({"total_calls": idx}) for idx in range(500)]
+    service.history_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    history = service.read_history(limit=3)
+
+    assert [sample["total_calls"] for sample in history] == [497, 498, 499]
+
+
+@pytest.mark.unit
+def test_read_history_handles_empty_and_unterminated_files(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    assert service.read_history() == []
+
+    service.history_path.write_text("", encoding="utf-8")
+    assert service.read_history() == []
+
+    service.history_path.write_text('{"total_calls": 1}\nnot-json\n{"total_calls": 2}', encoding="utf-8")
+    assert service.read_history(limit=5) == [{"total_calls": 1}, {"total_calls": 2}]
+
+
+@pytest.mark.unit
+def test_read_state_reparses_only_when_file_changes(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+    _write_json_atomic(service.state_path, {"pid": 0, "profile_id": "retail"})
+
+    calls = []
+    real_read_json = daemon_service._read_json
+
+    def counting_read_json(path):
+        calls.append(path)
+        return real_read_json(path)
+
+    monkeypatch.setattr(daemon_service, "_read_json", counting_read_json)
+
+    first = service.read_state()
+    first["pid"] = 123  # Mutating a returned copy must not leak into the cache.
+    assert service.read_state() == {"pid": 0, "profile_id": "retail"}
+    assert len(calls) == 1
+
+    _write_json_atomic(service.state_path, {"pid": 0, "profile_id": "finance", "extra": True})
+    assert service.read_state()["profile_id"] == "finance"
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_load_agents_skips_incomplete_rows() -> None:
+    rows = [
+        {
+            "agent_id": "AG001",
+            "name": "ORG-Support-AG001",
+            "azure_id": "ORG-Support-AG001:1",
+            "version": 1,
+            "model": "gpt-test",
+            "org_id": "ORG",
+            "agent_type": "Support",
+        },
+        {"name": "missing-fields"},
+        {
+            "agent_id": "AG002",
+            "name": "ORG-Support-AG002",
+            "azure_id": "ORG-Support-AG002:1",
+            "version": "not-a-number",
+            "model": "gpt-test",
+            "org_id": "ORG",
+        },
+    ]
+
+    agents = daemon_service._load_agents(rows)
+
+    assert [agent.agent_id for agent in agents] == ["AG001"]
@@ -1,3 +1,4 @@
+import os
 import sys
 import time
 from pathlib import Path
@@ -5,7 +6,7 @@ from pathlib import Path
 import pytest
 
 from src.core import config
-from src.core.daemon_service import DaemonService, _write_json_atomic
+from src.core.daemon_service import DaemonService, _wait_for_exit, _write_json_atomic
 import subprocess
 
 
@@ -86,3 +87,131 @@ def test_stop_reaps_process_and_updates_state(monkeypatch, tmp_path) -> None:
         except Exception:
             pass
 
+
+@pytest.mark.unit
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="process lifecycle assertions require /proc")
+def test_wait_for_exit_returns_promptly_when_process_exits() -> None:
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.3)"])
+    try:
+        started = time.monotonic()
+        assert _wait_for_exit(proc.pid, 5.0) is True
+        assert time.monotonic() - started < 3.0
+
+        proc_alive = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        try:
+            assert _wait_for_exit(proc_alive.pid, 0.1) is False
+        finally:
+            proc_alive.kill()
+            proc_alive.wait(timeout=2)
+    finally:
+        proc.wait(timeout=2)
+
+
+@pytest.mark.unit
+def test_stop_without_any_pid_reports_not_running(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    assert service.is_running() is False
+    assert service.stop(timeout=0.1) == (False, "Daemon is not running")
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="process lifecycle assertions require /proc")
+def test_is_running_adopts_pid_from_state(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        _write_json_atomic(service.state_path, {"pid": proc.pid, "started_at": "test"})
+
+        assert service.is_running() is True
+        assert service._read_pid() == proc.pid
+    finally:
+        proc.kill()
+        proc.wait(timeout=2)
+
+
+@pytest.mark.unit
+def test_claim_pidfile_is_exclusive_and_replaces_stale(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    assert service._claim_pidfile() is True
+    # A fresh placeholder means another start is in progress.
+    assert service._claim_pidfile() is False
+
+    service._write_pid(os.getpid())
+    assert service._claim_pidfile() is False
+
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait(timeout=5)
+    service._write_pid(proc.pid)
+    assert service._claim_pidfile() is True
+    assert service._read_pid() == 0
+
+
+@pytest.mark.unit
+def test_claim_pidfile_reclaims_placeholder_of_exited_claimant(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    assert service._claim_pidfile() is True
+    assert service._read_pidfile() == (0, os.getpid())
+    assert "start already in progress" in service._claim_wait_message()
+    assert f"PID {os.getpid()}" in service._claim_wait_message()
+
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait(timeout=5)
+    service.pid_path.write_text(f"0\n{proc.pid}", encoding="ascii")
+    # A crashed claimant no longer blocks starts for the grace window.
+    assert service._claim_pidfile() is True
+    assert service._read_pidfile() == (0, os.getpid())
+
+
+@pytest.mark.unit
+def test_start_releases_claim_when_setup_fails(monkeypatch, tmp_path) -> None:
+    from src.core import daemon_service
+    from src.core.daemon_runner import DaemonConfig
+    from src.models.agent import CreatedAgent
+
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    def fail(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(daemon_service, "_write_json_atomic", fail)
+    agent = CreatedAgent(agent_id="AG001", name="ORG-Support-AG001", azure_id="a", version=1, model="m", org_id="ORG")
+
+    with pytest.raises(OSError, match="disk full"):
+        service.start(DaemonConfig(), [agent], "profile", "Profile")
+    assert not service.pid_path.exists()
+
+
+@pytest.mark.unit
+def test_claim_pidfile_does_not_remove_a_claim_made_while_judging(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "DAEMON_RESULTS_DIR", tmp_path)
+    service = DaemonService()
+
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait(timeout=5)
+    service.pid_path.write_text(f"0\n{proc.pid}", encoding="ascii")
+
+    read_pidfile = service._read_pidfile
+    fresh_claim = f"0\n{os.getpid()}"
+
+    def racing_read():
+        result = read_pidfile()
+        # Another starter reclaims the stale file before this one unlinks it.
+        replacement = tmp_path / "claim.tmp"
+        replacement.write_text(fresh_claim, encoding="ascii")
+        os.replace(replacement, service.pid_path)
+        monkeypatch.setattr(service, "_read_pidfile", read_pidfile)
+        return result
+
+    monkeypatch.setattr(service, "_read_pidfile", racing_read)
+
+    assert service._claim_pidfile() is False
+    assert service.pid_path.read_text(encoding="ascii") == fresh_claim
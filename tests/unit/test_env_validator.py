@@ -32,3 +32,47 @@ def test_update_env_file_writes_endpoint(tmp_path, monkeypatch):
     assert env_file.read_text(encoding="utf-8").strip() == f"PROJECT_ENDPOINT={endpoint}"
     assert os.environ.get("PROJECT_ENDPOINT") == endpoint
     assert "Successfully updated" in message
+
+
+@pytest.mark.unit
+def test_update_env_file_appends_or_replaces_endpoint(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    monkeypatch.setattr(EnvValidator, "ENV_FILE", env_file)
+    monkeypatch.setattr(EnvValidator, "reload_environment", lambda: None)
+    monkeypatch.setattr(EnvValidator, "_update_azure_client", lambda endpoint: None)
+
+    first = "https://first.services.ai.azure.com/api/projects/first"
+    second = "https://second.services.ai.azure.com/api/projects/second"
+
+    env_file.write_text("OTHER=1", encoding="utf-8")
+    assert EnvValidator.update_env_file(first)[0] is True
+    assert env_file.read_text(encoding="utf-8") == f"OTHER=1\nPROJECT_ENDPOINT={first}\n"
+
+    assert EnvValidator.update_env_file(second)[0] is True
+    assert env_file.read_text(encoding="utf-8") == f"OTHER=1\nPROJECT_ENDPOINT={second}\n"
+
+
+@pytest.mark.unit
+def test_validate_is_memoized_per_env_value(monkeypatch):
+    monkeypatch.setenv("PROJECT_ENDPOINT", "https://cached.services.ai.azure.com/api/projects/x")
+    first = EnvValidator.validate()
+    assert first.is_valid is True
+    assert EnvValidator.validate() == first
+
+    monkeypatch.setenv("PROJECT_ENDPOINT", " ")
+    result = EnvValidator.validate()
+    assert result.is_valid is False
+    assert "Setup Guide:" in result.setup_guide
+
+
+@pytest.mark.unit
+def test_validate_results_are_not_shared_between_callers(monkeypatch):
+    monkeypatch.delenv("PROJECT_ENDPOINT", raising=False)
+    first = EnvValidator.validate()
+    first.missing_vars.append("OTHER")
+    first.is_valid = True
+
+    second = EnvValidator.validate()
+    assert second is not first
+    assert second.is_valid is False
+    assert second.missing_vars == ["PROJECT_ENDPOINT"]
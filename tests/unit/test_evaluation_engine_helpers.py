@@ -31,3 +31,388 @@ def test_build_dataset_name_is_safe_and_short():
 
     assert name.startswith("eval-template-with-spaces-agent-with-symbols")
     assert len(name) <= 80
+
+    long_name = engine._build_dataset_name("t" * 60, "a" * 60, "20240101T000000Z-0007")
+    assert len(long_name) == 80
+    assert long_name.endswith("-20240101t000000z-0007")
+
+
+@pytest.mark.unit
+def test_run_executes_agent_runs_concurrently_and_keeps_order(monkeypatch):
+    import threading
+
+    from src.core import evaluation_engine as module
+    from src.core.evaluation_engine import AgentInfo
+
+    engine = EvaluationEngine(max_workers=3)
+    template = type("T", (), {"id": "tpl", "evaluators": [], "dataset_items": [object()]})()
+    agents = [AgentInfo(name=f"agent-{i}") for i in range(3)]
+    barrier = threading.Barrier(3, timeout=5)
+    progress = []
+
+    monkeypatch.setattr(engine.template_loader, "load_template", lambda tid: template)
+    monkeypatch.setattr(engine, "_resolve_agents", lambda names, log_callback=None: agents)
+    monkeypatch.setattr(engine, "_create_eval_definition", lambda template, *args, **kwargs: f"eval-{template.id}")
+    monkeypatch.setattr(engine, "_prepare_dataset", lambda template: "prepared")
+    monkeypatch.setattr(module, "get_openai_client", lambda: object())
+    monkeypatch.setattr(module, "get_project_client", lambda: object())
+
+    def fake_run(template, agent, openai_client, eval_id, project_endpoint, log_callback=None, writer=None, timestamp=None, dataset=None):
+        # Every run must be in flight at once for the barrier to release.
+        barrier.wait()
+        assert dataset == "prepared"
+        return {"agent_name": agent.name, "eval_id": eval_id, "timestamp": timestamp}
+
+    monkeypatch.setattr(engine, "_run_template_for_agent", fake_run)
+
+    results = engine.run(
+        template_ids=["tpl", "tpl"],
+        agent_names=[agent.name for agent in agents],
+        progress_callback=lambda current, total, message: progress.append((current, total)),
+    )
+
+    assert [result["agent_name"] for result in results] == ["agent-0", "agent-1", "agent-2"]
+    assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+    assert len({result["timestamp"] for result in results}) == 3
+    assert {result["eval_id"] for result in results} == {"eval-tpl"}
+
+
+@pytest.mark.unit
+def test_wait_for_run_backs_off_and_logs_status_changes(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.core import evaluation_engine as module
+
+    statuses = iter(["queued", "in_progress", "in_progress", "in_progress", "completed"])
+    runs = SimpleNamespace(retrieve=lambda eval_id, run_id: SimpleNamespace(status=next(statuses)))
+    client = SimpleNamespace(evals=SimpleNamespace(runs=runs))
+    sleeps = []
+    logs = []
+    monkeypatch.setattr(module.time, "sleep", sleeps.append)
+
+    run = EvaluationEngine()._wait_for_run(client, eval_id="e", run_id="r", log_callback=logs.append)
+
+    assert run.status == "completed"
+    assert logs == ["[*] Run r status: queued", "[*] Run r status: in_progress"]
+    assert [int(delay) for delay in sleeps] == [1, 2, 4, 8]
+
+
+@pytest.mark.unit
+def test_list_output_items_follows_manual_cursor_pages():
+    from types import SimpleNamespace
+
+    pages = {
+        None: SimpleNamespace(data=[SimpleNamespace(id="a"), SimpleNamespace(id="b")], has_more=True),
+        "b": SimpleNamespace(data=[SimpleNamespace(id="c")], has_more=False),
+    }
+    calls = []
+
+    def list_items(eval_id, run_id, limit, after=None):
+        calls.append(after)
+        return pages[after]
+
+    output_items = SimpleNamespace(list=list_items)
+    client = SimpleNamespace(evals=SimpleNamespace(runs=SimpleNamespace(output_items=output_items)))
+
+    items = EvaluationEngine()._list_output_items(client, eval_id="e", run_id="r")
+
+    assert [item["id"] for item in items] == ["a", "b", "c"]
+    assert calls == [None, "b"]
+
+
+@pytest.mark.unit
+def test_resolve_agents_reuses_cached_listing(monkeypatch):
+    from src.core import evaluation_engine as module
+
+    calls = []
+
+    class FakeManager:
+        def list_agents(self):
+            calls.append(1)
+            return [{"name": "agent-a", "id": "id-a", "model": "gpt", "version": "1"}]
+
+    monkeypatch.setattr(module, "AgentManager", FakeManager)
+    engine = EvaluationEngine()
+
+    first = engine._resolve_agents(["agent-a", "missing"])
+    second = engine._resolve_agents(["agent-a"])
+    engine._resolve_agents(["agent-a"], refresh=True)
+
+    assert [agent.azure_id for agent in first] == ["id-a"]
+    assert second == first
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_scan_dataset_reports_optional_fields():
+    from src.core.evaluation_engine import EvaluationItem
+
+    engine = EvaluationEngine()
+    items = [
+        EvaluationItem(query="q1"),
+        EvaluationItem(query="q2", context="ctx"),
+        EvaluationItem(query="q3", ground_truth="gt"),
+    ]
+
+    assert engine._scan_dataset(items) == (True, True)
+    assert engine._scan_dataset(items[:2]) == (True, False)
+    assert engine._scan_dataset([]) == (False, False)
+
+
+@pytest.mark.unit
+def test_write_jsonl_writes_one_compact_record_per_line(tmp_path):
+    path = tmp_path / "dataset.jsonl"
+    EvaluationEngine()._write_jsonl(path, [{"query": "a"}, {"query": "b", "context": "c"}])
+
+    assert path.read_text(encoding="utf-8") == '{"query":"a"}\n{"query":"b","context":"c"}\n'
+
+
+@pytest.mark.unit
+def test_file_writer_writes_queued_files_before_close(tmp_path):
+    from src.core.evaluation_engine import _FileWriter, _dumps_indented, _dumps_jsonl
+
+    writer = _FileWriter()
+    writer.submit(tmp_path / "data.jsonl", _dumps_jsonl, [{"query": "a"}])
+    writer.submit(tmp_path / "result.json", _dumps_indented, {"run_id": "r"})
+    writer.submit(tmp_path / "missing" / "x.json", _dumps_indented, {})
+
+    error = writer.close()
+
+    assert isinstance(error, FileNotFoundError)
+    assert (tmp_path / "data.jsonl").read_text(encoding="utf-8") == '{"query":"a"}\n'
+    assert '"run_id": "r"' in (tmp_path / "result.json").read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_write_bytes_atomic_replaces_without_leaving_temp_file(tmp_path):
+    from src.core.evaluation_engine import _write_bytes_atomic
+
+    path = tmp_path / "result.json"
+    path.write_bytes(b"old")
+    _write_bytes_atomic(path, b"new")
+
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["result.json"]
+
+
+@pytest.mark.unit
+def test_prepare_dataset_serializes_rows_once():
+    from types import SimpleNamespace
+
+    from src.core.evaluation_engine import EvaluationItem
+
+    template = SimpleNamespace(
+        dataset_items=[EvaluationItem(query="q1"), EvaluationItem(query="q2", context="ctx")],
+    )
+
+    dataset = EvaluationEngine()._prepare_dataset(template)
+
+    assert dataset.records == [{"query": "q1"}, {"query": "q2", "context": "ctx"}]
+    assert dataset.jsonl == b'{"query":"q1"}\n{"query":"q2","context":"ctx"}\n'
+    assert dataset.has_context is True
+    assert dataset.content == [{"item": record} for record in dataset.records]
+
+
+@pytest.mark.unit
+def test_run_reuses_factory_cached_clients(monkeypatch):
+    from src.core import azure_client
+
+    factory = azure_client._get_factory()
+    openai_client, project_client = object(), object()
+    monkeypatch.setattr(factory, "_openai_client", openai_client)
+    monkeypatch.setattr(factory, "_project_client", project_client)
+    monkeypatch.setenv("PROJECT_ENDPOINT", "https://cached.services.ai.azure.com/api/projects/x")
+
+    assert azure_client.get_openai_client() is openai_client
+    assert azure_client.get_openai_client() is openai_client
+    assert azure_client.get_project_client() is project_client
+
+
+@pytest.mark.unit
+def test_templates_require_model_is_remembered_per_template():
+    from types import SimpleNamespace
+
+    engine = EvaluationEngine()
+    model_template = SimpleNamespace(evaluators=[SimpleNamespace(type="Coherence")])
+    plain_template = SimpleNamespace(evaluators=[SimpleNamespace(type="string_check")])
+
+    assert engine._templates_require_model([plain_template]) is False
+    assert engine._templates_require_model([plain_template, model_template]) is True
+
+    model_template.evaluators = []
+    assert engine._templates_require_model([model_template]) is True
+
+    from src.core.evaluation_templates import EVALUATOR_SPECS
+
+    # The load-time spec wins over the raw type string
+    spec_template = SimpleNamespace(
+        evaluators=[SimpleNamespace(type="custom", spec=EVALUATOR_SPECS["fluency"])]
+    )
+    assert engine._templates_require_model([spec_template]) is True
+
+
+@pytest.mark.unit
+def test_extract_id_and_as_dict_accept_objects_and_dicts():
+    from types import SimpleNamespace
+
+    from src.core.evaluation_engine import _extract_id
+
+    assert _extract_id(SimpleNamespace(id="obj-1")) == "obj-1"
+    assert _extract_id({"id": "dict-1"}) == "dict-1"
+
+    engine = EvaluationEngine()
+    assert engine._as_dict({"id": "a"}) == {"id": "a"}
+    sdk_object = SimpleNamespace(id="b")
+    converted = engine._as_dict(sdk_object)
+    assert converted == {"id": "b"}
+    converted["extra"] = 1
+    assert not hasattr(sdk_object, "extra")
+    assert engine._as_dict(3) == {"value": 3}
+
+
+@pytest.mark.unit
+def test_run_template_streams_outputs_to_sidecar_file(monkeypatch, tmp_path):
+    import json
+    from types import SimpleNamespace
+
+    from src.core import config
+    from src.core.evaluation_engine import AgentInfo, EvaluationItem
+
+    monkeypatch.setattr(config, "EVALUATIONS_RESULTS_DIR", tmp_path)
+    monkeypatch.setattr(config, "ensure_directories", lambda: None)
+
+    pages = {
+        None: SimpleNamespace(
+            data=[SimpleNamespace(id="o1", status="pass"), SimpleNamespace(id="o2", status="fail")],
+            has_more=False,
+        )
+    }
+    runs = SimpleNamespace(
+        create=lambda eval_id, name, data_source: SimpleNamespace(id="run-1"),
+        retrieve=lambda eval_id, run_id: SimpleNamespace(status="completed", report_url=None),
+        output_items=SimpleNamespace(list=lambda eval_id, run_id, limit, after=None: pages[after]),
+    )
+    client = SimpleNamespace(evals=SimpleNamespace(runs=runs))
+    template = SimpleNamespace(id="tpl", display_name="Tpl", dataset_items=[EvaluationItem(query="q")])
+
+    def run(engine):
+        result = engine._run_template_for_agent(
+            template=template,
+            agent=AgentInfo(name="agent"),
+            openai_client=client,
+            eval_id="eval-1",
+            project_endpoint="",
+            timestamp="20240101T000000Z",
+        )
+        return json.loads(open(result["result_path"], encoding="utf-8").read())
+
+    # Default keeps the original schema: outputs embedded in the result JSON
+    record = run(EvaluationEngine())
+    assert [item["id"] for item in record["outputs"]] == ["o1", "o2"]
+    assert "outputs_path" not in record
+
+    record = run(EvaluationEngine(stream_outputs=True))
+    assert "outputs" not in record
+    assert record["output_count"] == 2
+    assert record["output_status_counts"] == {"pass": 1, "fail": 1}
+    lines = open(record["outputs_path"], encoding="utf-8").read().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["o1", "o2"]
+
+
+@pytest.mark.unit
+def test_create_eval_definition_reuses_identical_definitions():
+    from types import SimpleNamespace
+
+    from src.core.evaluation_engine import EvaluationItem
+
+    created = []
+
+    def create(name, data_source_config, testing_criteria):
+        created.append(name)
+        return SimpleNamespace(id=f"eval-{len(created)}")
+
+    client = SimpleNamespace(evals=SimpleNamespace(create=create))
+    template = SimpleNamespace(
+        id="tpl",
+        display_name="Tpl",
+        dataset_items=[EvaluationItem(query="q")],
+        evaluators=[EvaluatorDefinition(name="check", type="string_check", params={"reference": "x"})],
+    )
+    engine = EvaluationEngine()
+    # Stand in for the SDK TypedDict, which is a plain dict at runtime.
+    engine._build_data_source_config = lambda template, dataset_flags=None: {"type": "custom"}
+
+    first = engine._create_eval_definition(template, client, model_deployment_name=None)
+    second = engine._create_eval_definition(template, client, model_deployment_name=None)
+    forced = engine._create_eval_definition(template, client, model_deployment_name=None, force_recreate=True)
+
+    assert first == second == "eval-1"
+    assert forced == "eval-2"
+
+
+@pytest.mark.unit
+def test_arun_runs_off_the_event_loop_thread(monkeypatch):
+    import asyncio
+    import threading
+
+    engine = EvaluationEngine()
+    seen = {}
+
+    def fake_run(template_ids, agent_names, **kwargs):
+        seen["thread"] = threading.current_thread()
+        seen["kwargs"] = kwargs
+        return [{"agent_name": agent_names[0]}]
+
+    monkeypatch.setattr(engine, "run", fake_run)
+
+    results = asyncio.run(engine.arun(["tpl"], ["agent"], model_deployment_name="gpt"))
+
+    assert results == [{"agent_name": "agent"}]
+    assert seen["thread"] is not threading.main_thread()
+    assert seen["kwargs"]["model_deployment_name"] == "gpt"
+
+
+@pytest.mark.unit
+def test_list_recent_runs_merges_runs_from_every_eval(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.core import evaluation_engine as module
+
+    run_pages = {
+        "e1": [{"id": "r1", "name": "Eval one - agent-a", "status": "completed", "created_at": 1}],
+        "e2": [{"id": "r2", "data_source": {"target": {"name": "agent-b"}}, "created_at": 2}],
+    }
+    evals = SimpleNamespace(
+        list=lambda order, limit: SimpleNamespace(data=[{"id": "e1", "name": "Eval one"}, {"id": "e2"}, {}]),
+        runs=SimpleNamespace(list=lambda eval_id, order, limit: SimpleNamespace(data=run_pages[eval_id])),
+    )
+    monkeypatch.setattr(module, "get_openai_client", lambda: SimpleNamespace(evals=evals))
+
+    runs = EvaluationEngine().list_recent_runs()
+
+    assert [(run["run_id"], run["eval_id"], run["agent_name"]) for run in runs] == [
+        ("r2", "e2", "agent-b"),
+        ("r1", "e1", "agent-a"),
+    ]
+    assert runs[1]["evaluation_name"] == "Eval one"
+    assert runs[0]["run_status"] == "Unknown"
+
+
+@pytest.mark.unit
+def test_created_clients_share_the_factory_credential(monkeypatch):
+    from src.core import azure_client
+
+    factory = azure_client._get_factory()
+    monkeypatch.setattr(factory, "_credential", None)
+    seen = []
+
+    class RecordingProjectClient:
+        def __init__(self, endpoint, credential):
+            seen.append(credential)
+
+    monkeypatch.setattr(azure_client, "AIProjectClient", RecordingProjectClient)
+
+    azure_client.create_project_client()
+    azure_client.create_project_client()
+
+    assert seen[0] is seen[1] is factory.get_credential()
@@ -37,4 +37,88 @@ evaluators:
     assert template.id == "basic"
     assert template.display_name == "Basic Eval"
     assert template.dataset_items[0].query == "Hello"
+    assert template.dataset_flags == (True, True)
     assert template.evaluators[0].name == "Relevance"
+    assert template.evaluators[0].type == "relevance"
+    assert template.evaluators[0].spec.builtin_name == "builtin.relevance"
+    assert template.evaluators[0].spec.needs_model is True
+
+
+@pytest.mark.unit
+def test_evaluator_types_are_normalized_to_lowercase(tmp_path: Path):
+    (tmp_path / "mixed.yaml").write_text(
+        """
+id: mixed
+evaluators:
+  - name: Relevance
+    type: " Relevance "
+  - name: Bleu
+    type: BLEU_SCORE
+""".lstrip(),
+        encoding="utf-8",
+    )
+
+    template = EvaluationTemplateLoader(templates_dir=tmp_path).load_template("mixed")
+
+    assert [evaluator.type for evaluator in template.evaluators] == ["relevance", "bleu_score"]
+    assert template.evaluators[0].spec.builtin_name == "builtin.relevance"
+
+
+@pytest.mark.unit
+def test_unknown_evaluator_type_fails_only_when_template_runs(tmp_path: Path):
+    from src.core.evaluation_engine import EvaluationEngine
+
+    (tmp_path / "bad.yaml").write_text(
+        """
+id: bad
+evaluators:
+  - name: Mystery
+    type: mystery_score
+""".lstrip(),
+        encoding="utf-8",
+    )
+    (tmp_path / "good.yaml").write_text("id: good\n", encoding="utf-8")
+
+    loader = EvaluationTemplateLoader(templates_dir=tmp_path)
+    assert sorted(template.id for template in loader.list_templates()) == ["bad", "good"]
+
+    template = loader.load_template("bad")
+    assert template.evaluators[0].spec is None
+    with pytest.raises(ValueError, match="Unsupported evaluator type 'mystery_score'"):
+        EvaluationEngine()._build_testing_criteria(template, "gpt-4o")
+
+
+@pytest.mark.unit
+def test_evaluation_template_loader_caches_until_file_changes(tmp_path: Path):
+    import os
+
+    path = tmp_path / "cached.yaml"
+    path.write_text("id: cached\ndisplay_name: First\n", encoding="utf-8")
+    loader = EvaluationTemplateLoader(templates_dir=tmp_path)
+
+    parses = []
+    load_from_path = loader._load_from_path
+    loader._load_from_path = lambda p: parses.append(p) or load_from_path(p)
+
+    first = loader.load_template("cached")
+    second = loader.load_template("cached")
+    assert len(parses) == 1
+    assert second == first and second is not first
+    first.display_name = "Mutated"
+    first.evaluators.append(None)
+    assert loader.load_template("cached").display_name == "First"
+    assert loader.load_template("cached").evaluators == []
+
+    path.write_text("id: cached\ndisplay_name: Second\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert loader.load_template("cached").display_name == "Second"
+
+    # An edit within the same mtime tick is still picked up via the size
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text("id: cached\ndisplay_name: Third edit\n", encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert loader.load_template("cached").display_name == "Third edit"
+
+    with pytest.raises(FileNotFoundError):
+        loader.load_template("missing")
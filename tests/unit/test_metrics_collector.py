@@ -106,3 +106,153 @@ def test_guardrail_summary_counts():
     assert summary["blocked"] == 1
     assert summary["allowed"] == 1
     assert summary["category_stats"]["harm"]["total"] == 2
+
+
+@pytest.mark.unit
+def test_operation_summary_latency_and_distributions():
+    collector = MetricsCollector()
+    for i, (latency, success, model) in enumerate(
+        [(300.0, True, "model-a"), (100.0, True, "model-b"), (50.0, False, "model-a")]
+    ):
+        collector.add_operation_dict(
+            {
+                "timestamp": f"2024-01-01T00:00:0{i}",
+                "agent_id": f"AG00{i}",
+                "agent_name": f"ORG-Agent-AG00{i}",
+                "azure_id": f"azure-{i}",
+                "model": model,
+                "org_id": "ORG001",
+                "agent_type": "Agent" if i else "Other",
+                "query": "hello",
+                "query_length": 5,
+                "response_text": "hi",
+                "response_length": 2,
+                "latency_ms": latency,
+                "success": success,
+            }
+        )
+
+    summary = collector.get_operation_summary()
+
+    assert summary["avg_latency_ms"] == 200.0
+    assert summary["min_latency_ms"] == 100.0
+    assert summary["max_latency_ms"] == 300.0
+    assert summary["model_distribution"] == {"model-a": 2, "model-b": 1}
+    assert summary["agent_type_distribution"] == {"Other": 1, "Agent": 2}
+    assert type(summary["model_distribution"]) is dict
+
+
+@pytest.mark.unit
+def test_save_guardrails_csv_writes_header_and_rows(tmp_path):
+    import csv
+
+    collector = MetricsCollector()
+    collector.add_guardrail_metric(
+        GuardrailMetric(
+            timestamp="2024-01-01T00:00:00",
+            agent_id="AG001",
+            agent_name="ORG-Agent-AG001",
+            azure_id="azure-1",
+            model="model-a",
+            org_id="ORG001",
+            test_category="harm",
+            test_query="test, with comma",
+            query_length=16,
+            response_text=None,
+            response_length=0,
+            latency_ms=12.5,
+            blocked=True,
+            content_filter_triggered=True,
+        )
+    )
+    path = tmp_path / "guardrails.csv"
+    collector.save_guardrails_csv(str(path))
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert len(rows) == 1
+    assert rows[0]["test_query"] == "test, with comma"
+    assert rows[0]["response_text"] == ""
+    assert rows[0]["blocked"] == "True"
+    assert rows[0]["guardrail_status"] == "UNKNOWN"
+
+
+@pytest.mark.unit
+def test_concurrent_adds_are_all_recorded():
+    from concurrent.futures import ThreadPoolExecutor
+
+    collector = MetricsCollector()
+
+    def emit(worker: int) -> None:
+        for i in range(200):
+            collector.add_operation_dict(
+                {
+                    "timestamp": "2024-01-01T00:00:00",
+                    "agent_id": f"AG{worker}",
+                    "agent_name": f"ORG-Agent-AG{worker}",
+                    "azure_id": "azure",
+                    "model": "model-a",
+                    "org_id": "ORG001",
+                    "agent_type": "Agent",
+                    "query": "q",
+                    "query_length": 1,
+                    "response_text": "r",
+                    "response_length": 1,
+                    "latency_ms": float(i),
+                    "success": True,
+                }
+            )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(emit, range(8)))
+
+    assert collector.operation_count == 1600
+    assert collector.get_operation_summary()["successful_calls"] == 1600
+
+
+@pytest.mark.unit
+def test_summaries_track_metrics_added_between_polls():
+    collector = MetricsCollector()
+    base = {
+        "timestamp": "2024-01-01T00:00:00",
+        "agent_id": "AG001",
+        "agent_name": "ORG-Agent-AG001",
+        "azure_id": "azure-1",
+        "model": "model-a",
+        "org_id": "ORG001",
+        "test_category": "harm",
+        "test_query": "test",
+        "query_length": 4,
+        "response_text": "refuse",
+        "response_length": 6,
+        "latency_ms": 10.0,
+        "blocked": True,
+        "content_filter_triggered": False,
+    }
+    collector.add_guardrail_dict(base)
+    first = collector.get_guardrail_summary()
+    assert first["category_stats"]["harm"] == {"total": 1, "blocked": 1, "block_rate": 100.0}
+
+    collector.add_guardrail_dict({**base, "blocked": False, "model": "model-b"})
+    second = collector.get_guardrail_summary()
+    assert second["total_tests"] == 2
+    assert second["category_stats"]["harm"] == {"total": 2, "blocked": 1, "block_rate": 50.0}
+    assert second["model_stats"]["model-b"]["block_rate"] == 0.0
+    assert second["recommendation"] == "CRITICAL"
+    # Earlier summaries are not mutated by later polls
+    assert first["total_tests"] == 1
+
+    collector.clear()
+    assert collector.get_guardrail_summary() == {"total_tests": 0}
+
+
+@pytest.mark.unit
+def test_save_operation_summary_round_trips(tmp_path):
+    import json
+
+    collector = MetricsCollector()
+    path = tmp_path / "nested" / "summary.json"
+    collector.save_operation_summary(str(path))
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"total_calls": 0}
@@ -0,0 +1,378 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.simulation_engine import SimulationEngine
+from src.models.agent import CreatedAgent
+
+
+def _agent(name: str = "ORG01-Support-AG001") -> CreatedAgent:
+    return CreatedAgent(
+        agent_id="AG001",
+        name=name,
+        azure_id="azure-1",
+        version=1,
+        model="gpt-4o",
+        org_id="ORG01",
+    )
+
+
+class _FakeOpenAI:
+    def __init__(self, fail_first: bool = False):
+        self.created = 0
+        self.used = []
+        self._fail_first = fail_first
+        self.conversations = SimpleNamespace(create=self._create_conversation)
+        self.responses = SimpleNamespace(create=self._create_response)
+
+    def _create_conversation(self):
+        self.created += 1
+        return SimpleNamespace(id=f"conv-{self.created}")
+
+    def _create_response(self, conversation, extra_body, input):
+        self.used.append(conversation)
+        if self._fail_first:
+            self._fail_first = False
+            raise RuntimeError("boom")
+        return SimpleNamespace(output_text=f"echo {input}")
+
+
+@pytest.mark.unit
+def test_call_agent_reuses_conversation_per_agent_cache():
+    engine = SimulationEngine(agents=[_agent()])
+    client = _FakeOpenAI()
+    conversations = {}
+
+    for _ in range(3):
+        result = engine.call_agent(_agent(), "hi", openai_client=client, conversations=conversations)
+        assert result["success"] is True
+
+    assert client.created == 1
+    assert client.used == ["conv-1"] * 3
+    assert result["response_preview"] == "echo hi"
+
+    engine.call_agent(_agent("ORG01-Sales-AG002"), "hi", openai_client=client, conversations=conversations)
+    assert client.created == 2
+
+
+@pytest.mark.unit
+def test_call_agent_drops_cached_conversation_after_failure():
+    engine = SimulationEngine(agents=[_agent()])
+    client = _FakeOpenAI(fail_first=True)
+    conversations = {}
+
+    failed = engine.call_agent(_agent(), "hi", openai_client=client, conversations=conversations)
+    assert failed["success"] is False
+    assert conversations == {}
+
+    engine.call_agent(_agent(), "hi", openai_client=client, conversations=conversations)
+    assert client.used == ["conv-1", "conv-2"]
+
+
+@pytest.mark.unit
+def test_call_agent_without_cache_creates_conversation_each_call():
+    engine = SimulationEngine(agents=[_agent()])
+    client = _FakeOpenAI()
+
+    engine.call_agent(_agent(), "a", openai_client=client)
+    engine.call_agent(_agent(), "b", openai_client=client)
+
+    assert client.created == 2
+
+
+@pytest.mark.unit
+def test_save_results_writes_all_outputs(tmp_path):
+    from src.core.metrics_collector import OperationMetric
+
+    engine = SimulationEngine(agents=[_agent()])
+    engine.metrics.add_operation_metric(
+        OperationMetric(
+            timestamp="2024-01-01T00:00:00",
+            agent_id="AG001",
+            agent_name="ORG01-Support-AG001",
+            azure_id="azure-1",
+            model="gpt-4o",
+            org_id="ORG01",
+            agent_type="Support",
+            query="hi",
+            query_length=2,
+            response_text="hello",
+            response_length=5,
+            latency_ms=10.0,
+            success=True,
+        )
+    )
+
+    engine.save_results(
+        operations_csv=str(tmp_path / "ops.csv"),
+        operations_summary=str(tmp_path / "ops.json"),
+        guardrails_csv=str(tmp_path / "gr.csv"),
+        guardrails_summary=str(tmp_path / "gr.json"),
+    )
+
+    assert (tmp_path / "ops.csv").read_text(encoding="utf-8").startswith("timestamp,agent_id")
+    assert (tmp_path / "ops.json").exists()
+    assert not (tmp_path / "gr.csv").exists()
+
+
+@pytest.mark.unit
+def test_arun_operations_runs_off_the_event_loop(monkeypatch):
+    import asyncio
+
+    from src.core.simulation_engine import SimulationConfig
+
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", lambda: _FakeOpenAI())
+    engine = SimulationEngine(agents=[_agent()], query_templates={"Support": ["Help with {}"]})
+
+    summary = asyncio.run(engine.arun_operations(SimulationConfig(num_calls=4, threads=2, delay=0)))
+
+    assert summary["total_calls"] == 4
+    assert summary["successful_calls"] == 4
+
+
+@pytest.mark.unit
+def test_is_blocked_response_detects_refusals_and_filters():
+    from src.core.simulation_engine import is_blocked_response
+
+    assert is_blocked_response("Sorry, I CANNOT help with that.", None) == (True, False)
+    assert is_blocked_response("That would be ILLEGAL.", "") == (True, False)
+    assert is_blocked_response("Sure, here is the weather.", None) == (False, False)
+    assert is_blocked_response(None, "Request blocked by Content Filter") == (True, True)
+    assert is_blocked_response("", "") == (False, False)
+
+
+@pytest.mark.unit
+def test_generate_query_fills_placeholders_from_current_templates():
+    engine = SimulationEngine(
+        agents=[_agent()],
+        query_templates={"Support": ["Order {} for {}"], "Plain": ["Just help"], "Empty": []},
+    )
+
+    words = engine.generate_query("Support").split()
+    assert words[0] == "Order" and words[2] == "for"
+    assert 1000 <= int(words[1]) <= 9999 and 1000 <= int(words[3]) <= 9999
+    assert engine.generate_query("Plain") == "Just help"
+    assert engine.generate_query("Empty") == "Can you help me with my request?"
+    assert engine.generate_query("Missing") == "Can you help me with my request?"
+
+    engine.query_templates["Plain"] = ["Updated help"]
+    engine.query_templates = {**engine.query_templates, "Missing": ["Now present"]}
+    assert engine.generate_query("Plain") == "Updated help"
+    assert engine.generate_query("Missing") == "Now present"
+
+
+@pytest.mark.unit
+def test_load_agents_from_csv_reads_positional_rows(tmp_path):
+    csv_path = tmp_path / "agents.csv"
+    csv_path.write_text(
+        "﻿agent_id,name,azure_id,version,model,org_id\n"
+        "AG001,ORG01-Support-AG001,azure-1,2,gpt-4o,ORG01\n"
+        "\n"
+        "AG002,ORG01-Sales-AG002,azure-2,1,gpt-4o-mini,ORG01\n",
+        encoding="utf-8",
+    )
+
+    engine = SimulationEngine(agents_csv=str(csv_path))
+
+    assert [a.agent_id for a in engine.agents] == ["AG001", "AG002"]
+    assert engine.agents[0].version == 2
+    assert engine.agents[1].agent_type == "Sales"
+    # Repeated column values share one interned string across agents
+    assert engine.agents[0].org_id is engine.agents[1].org_id
+
+
+@pytest.mark.unit
+def test_generators_are_reproducible_with_a_seeded_rng():
+    import random
+
+    engine = SimulationEngine(
+        agents=[_agent()],
+        query_templates={"Support": ["A {}", "B {} {}", "C"]},
+        guardrail_tests={"harm": ["x", "y"], "pii": ["z"]},
+    )
+
+    first = [engine.generate_query("Support", random.Random(7)) for _ in range(3)]
+    second = [engine.generate_query("Support", random.Random(7)) for _ in range(3)]
+    assert first == second
+    assert engine.generate_guardrail_query(None, random.Random(3)) == engine.generate_guardrail_query(
+        None, random.Random(3)
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("reuse, expected_conversations", [(None, 3), (True, 1), (False, 3)])
+def test_run_operations_honours_reuse_conversation(monkeypatch, reuse, expected_conversations):
+    from src.core.simulation_engine import SimulationConfig
+
+    client = _FakeOpenAI()
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", lambda: client)
+    engine = SimulationEngine(agents=[_agent()])
+
+    options = {} if reuse is None else {"reuse_conversation": reuse}
+    engine.run_operations(SimulationConfig(num_calls=3, threads=1, delay=0, **options))
+
+    assert client.created == expected_conversations
+
+
+@pytest.mark.unit
+def test_run_operations_rotates_reused_conversations(monkeypatch):
+    from src.core.simulation_engine import SimulationConfig
+
+    client = _FakeOpenAI()
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", lambda: client)
+    engine = SimulationEngine(agents=[_agent()])
+
+    engine.run_operations(
+        SimulationConfig(num_calls=5, threads=1, delay=0, reuse_conversation=True, conversation_max_turns=2)
+    )
+
+    assert client.used == ["conv-1", "conv-1", "conv-2", "conv-2", "conv-3"]
+
+
+@pytest.mark.unit
+def test_run_guardrails_without_queries_returns_before_starting_workers(monkeypatch):
+    from src.core.simulation_engine import SimulationConfig
+
+    def fail():
+        raise AssertionError("no client should be created")
+
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", fail)
+    engine = SimulationEngine(agents=[_agent()], guardrail_tests={"harm": []})
+
+    summary = engine.run_guardrails(SimulationConfig(num_calls=5, threads=2, delay=10))
+
+    assert summary == {"total_tests": 0}
+
+
+@pytest.mark.unit
+def test_call_agent_respects_shared_request_cap(monkeypatch):
+    monkeypatch.setattr(SimulationEngine, "MAX_CONCURRENT_REQUESTS", SimulationEngine.MAX_CONCURRENT_REQUESTS)
+    monkeypatch.setattr(SimulationEngine, "_request_semaphore", SimulationEngine._request_semaphore)
+    SimulationEngine.set_max_concurrent_requests(2)
+    with pytest.raises(ValueError):
+        SimulationEngine.set_max_concurrent_requests(0)
+
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    class _SlowOpenAI(_FakeOpenAI):
+        def _create_response(self, conversation, extra_body, input):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return SimpleNamespace(output_text="ok")
+
+    engines = [SimulationEngine(agents=[_agent()]) for _ in range(2)]
+    client = _SlowOpenAI()
+    threads = [
+        threading.Thread(target=engines[i % 2].call_agent, args=(_agent(), "hi"), kwargs={"openai_client": client})
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert in_flight[1] == 2
+
+
+@pytest.mark.unit
+def test_slow_callback_does_not_hold_a_request_slot(monkeypatch):
+    monkeypatch.setattr(SimulationEngine, "MAX_CONCURRENT_REQUESTS", SimulationEngine.MAX_CONCURRENT_REQUESTS)
+    monkeypatch.setattr(SimulationEngine, "_request_semaphore", SimulationEngine._request_semaphore)
+    SimulationEngine.set_max_concurrent_requests(1)
+
+    engine = SimulationEngine(agents=[_agent()])
+    release = threading.Event()
+    blocked = threading.Thread(
+        target=engine.call_agent,
+        args=(_agent(), "hi"),
+        kwargs={"openai_client": _FakeOpenAI(), "pre_call_callback": lambda msg: release.wait(5)},
+    )
+    blocked.start()
+    try:
+        result = engine.call_agent(_agent(), "hi", openai_client=_FakeOpenAI())
+        assert result["success"] is True
+        assert blocked.is_alive()  # finished while the other call sat in its callback
+    finally:
+        release.set()
+        blocked.join()
+
+
+@pytest.mark.unit
+def test_worker_clients_are_reused_across_runs(monkeypatch):
+    from src.core.simulation_engine import SimulationConfig
+
+    clients = []
+
+    def create():
+        clients.append(_FakeOpenAI())
+        return clients[-1]
+
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", create)
+    engine = SimulationEngine(agents=[_agent()])
+    config = SimulationConfig(num_calls=2, threads=1, delay=0)
+
+    engine.run_operations(config)
+    engine.run_operations(config)
+    assert len(clients) == 1
+
+    engine.reset_clients()
+    engine.run_operations(config)
+    assert len(clients) == 2
+
+
+@pytest.mark.unit
+def test_live_worker_threads_never_share_a_client(monkeypatch):
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", lambda: _FakeOpenAI())
+    engine = SimulationEngine(agents=[_agent()])
+    engine._run_workers(engine._get_worker_client, 1)  # leaves one idle client
+
+    barrier = threading.Barrier(2)
+    held = []
+
+    def worker():
+        held.append(engine._get_worker_client())
+        barrier.wait(timeout=5)
+
+    engine._run_workers(worker, 2)
+
+    assert len(held) == 2 and held[0] is not held[1]
+    assert len(engine._idle_clients) == 2
+
+
+@pytest.mark.unit
+def test_run_workers_uses_daemon_threads_and_surfaces_errors():
+    engine = SimulationEngine(agents=[_agent()])
+    seen = []
+
+    def worker():
+        seen.append(threading.current_thread().daemon)
+        raise RuntimeError("worker failed")
+
+    with pytest.raises(RuntimeError, match="worker failed"):
+        engine._run_workers(worker, 2)
+    assert seen == [True, True]
+
+
+@pytest.mark.unit
+def test_run_operations_spreads_calls_over_pre_drawn_agents(monkeypatch):
+    import random
+
+    from src.core.simulation_engine import SimulationConfig
+
+    monkeypatch.setattr("src.core.simulation_engine.create_openai_client", lambda: _FakeOpenAI())
+    agents = [_agent("ORG01-Support-AG001"), _agent("ORG01-Sales-AG002")]
+    engine = SimulationEngine(agents=agents)
+
+    random.seed(7)
+    engine.run_operations(SimulationConfig(num_calls=20, threads=2, delay=0))
+
+    names = [metric.agent_name for metric in engine.metrics.operation_metrics]
+    assert len(names) == 20
+    assert set(names) == {agent.name for agent in agents}
@@ -675,7 +675,9 @@ class SimulationScreen(Screen):
             delay=delay,
         )
 
-        # Create engine
+        # Create engine (releasing the previous engine's worker clients)
+        if self.engine:
+            self.engine.close()
         query_templates = profile.get_query_templates_dict()
         guardrail_tests = profile.guardrail_tests.get_all_tests()
 
@@ -758,6 +760,7 @@ class SimulationScreen(Screen):
         """Stop the one-time simulation."""
         if self.engine and self.simulation_active:
             self.engine.stop()
+            self.engine.close()
             self.simulation_active = False
             self.engine = None
             self._log_onetime("[!] Simulation stopped by user")